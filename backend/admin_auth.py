@@ -6,7 +6,6 @@ Handles instance admin login, token generation, and session management
 import os
 import pyotp
 import jwt
-import bcrypt
 import ipaddress
 from datetime import datetime, timedelta, timezone
 from typing import Optional
@@ -16,7 +15,7 @@ from sqlalchemy import and_
 from sqlalchemy.orm import Session
 
 from database import SessionLocal
-from models import AdminUser, AuditLog
+from models import AdminUser, AuditLog, hash_password, verify_password, verify_totp  # noqa: F401  # re-exported for callers
 
 # Security configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "your-super-secret-key-change-in-production")
@@ -35,31 +34,6 @@ class AdminAuthError(Exception):
     pass
 
 
-class AdminLoginRequest:
-    """Request model for admin login"""
-    def __init__(self, username: str, password: str):
-        self.username = username
-        self.password = password
-
-
-class AdminTOTPRequest:
-    """Request model for TOTP verification"""
-    def __init__(self, temp_token: str, totp_code: str):
-        self.temp_token = temp_token
-        self.totp_code = totp_code
-
-
-def hash_password(password: str) -> str:
-    """Hash a password using bcrypt"""
-    salt = bcrypt.gensalt(rounds=12)
-    return bcrypt.hashpw(password.encode(), salt).decode()
-
-
-def verify_password(password: str, hashed: str) -> bool:
-    """Verify a password against its hash"""
-    return bcrypt.checkpw(password.encode(), hashed.encode())
-
-
 def generate_temp_token(admin_id: int) -> str:
     """Generate a temporary token for 2FA step (valid for 5 minutes)"""
     payload = {
@@ -286,10 +260,8 @@ def verify_admin_totp(admin: AdminUser, totp_code: str) -> bool:
     if not admin.totp_enabled or not admin.totp_secret:
         raise AdminAuthError("2FA not configured for this admin")
     
-    totp = pyotp.TOTP(admin.totp_secret)
-    
     # Allow for time skew (current, +30s, -30s)
-    return totp.verify(totp_code, valid_window=1)
+    return verify_totp(totp_code, admin.totp_secret)
 
 
 def get_totp_secret() -> str:
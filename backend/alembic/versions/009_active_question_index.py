@@ -0,0 +1,30 @@
+"""Add partial index for today's active question lookup
+
+Revision ID: 009_active_question_index
+Revises: 008_avatar_upload
+Create Date: 2026-02-02
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '009_active_question_index'
+down_revision = '008_avatar_upload'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Today's question is looked up by (group_id, question_date range) WHERE is_active
+    op.create_index(
+        'idx_group_date_active',
+        'daily_questions',
+        ['group_id', 'question_date'],
+        postgresql_where=sa.text('is_active'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_group_date_active', table_name='daily_questions')
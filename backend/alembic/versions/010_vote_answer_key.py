@@ -0,0 +1,55 @@
+"""Store binary vote answers as an option index
+
+Revision ID: 010_vote_answer_key
+Revises: 009_active_question_index
+Create Date: 2026-02-04
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '010_vote_answer_key'
+down_revision = '009_active_question_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Index of the chosen option for binary votes; answer is left NULL for those rows
+    op.add_column('votes', sa.Column('answer_key', sa.SmallInteger(), nullable=True))
+
+    # Move existing binary votes over to the option index
+    op.execute("""
+        UPDATE votes v
+        SET answer_key = CASE WHEN v.answer = (dq.options::json->>0) THEN 0 ELSE 1 END,
+            answer = NULL
+        FROM daily_questions dq
+        WHERE v.question_id = dq.id
+          AND dq.question_type = 'BINARY_VOTE'
+          AND NOT COALESCE(dq.allow_multiple, false)
+          AND dq.options IS NOT NULL
+          AND v.answer IN (dq.options::json->>0, dq.options::json->>1)
+    """)
+
+    op.create_index(
+        'idx_vote_answer_key',
+        'votes',
+        ['question_id', 'answer_key'],
+        postgresql_where=sa.text('answer_key IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_vote_answer_key', table_name='votes')
+
+    # Restore the option text for binary votes
+    op.execute("""
+        UPDATE votes v
+        SET answer = dq.options::json->>v.answer_key
+        FROM daily_questions dq
+        WHERE v.question_id = dq.id
+          AND v.answer_key IS NOT NULL
+    """)
+    op.drop_column('votes', 'answer_key')
@@ -0,0 +1,143 @@
+"""Maintain group_analytics counters with triggers
+
+Revision ID: 011_group_analytics_triggers
+Revises: 010_vote_answer_key
+Create Date: 2026-02-06
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '011_group_analytics_triggers'
+down_revision = '010_vote_answer_key'
+branch_labels = None
+depends_on = None
+
+
+TRIGGERS_SQL = """
+CREATE OR REPLACE FUNCTION group_analytics_bump(
+    p_group_id integer, d_members integer, d_questions integer, d_votes integer, d_eligible integer
+) RETURNS void AS $$
+BEGIN
+    IF p_group_id IS NULL THEN
+        RETURN;
+    END IF;
+    UPDATE group_analytics SET
+        total_members = COALESCE(total_members, 0) + d_members,
+        total_questions_created = COALESCE(total_questions_created, 0) + d_questions,
+        total_votes_cast = COALESCE(total_votes_cast, 0) + d_votes,
+        participating_user_days = COALESCE(participating_user_days, 0) + d_votes,
+        eligible_user_days = COALESCE(eligible_user_days, 0) + d_eligible,
+        average_participation_rate = CASE
+            WHEN COALESCE(eligible_user_days, 0) + d_eligible > 0
+            THEN (COALESCE(participating_user_days, 0) + d_votes)::float / (COALESCE(eligible_user_days, 0) + d_eligible)
+            ELSE 0 END,
+        last_updated = now() AT TIME ZONE 'utc'
+    WHERE group_id = p_group_id;
+    -- Only growth creates a row; decrements come from deletes (possibly of the group itself)
+    IF NOT FOUND AND d_members >= 0 AND d_questions >= 0 AND d_votes >= 0 AND d_eligible >= 0 THEN
+        INSERT INTO group_analytics (
+            group_id, total_members, total_questions_created, total_votes_cast,
+            participating_user_days, eligible_user_days, average_participation_rate, last_updated
+        ) VALUES (
+            p_group_id, d_members, d_questions, d_votes, d_votes, d_eligible,
+            CASE WHEN d_eligible > 0 THEN d_votes::float / d_eligible ELSE 0 END,
+            now() AT TIME ZONE 'utc'
+        )
+        ON CONFLICT (group_id) DO NOTHING;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION group_analytics_on_user() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM group_analytics_bump(NEW.group_id, 1, 0, 0, 0);
+    ELSE
+        PERFORM group_analytics_bump(OLD.group_id, -1, 0, 0, 0);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION group_analytics_on_question() RETURNS trigger AS $$
+DECLARE
+    members integer;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT count(*) INTO members FROM users WHERE group_id = NEW.group_id;
+        PERFORM group_analytics_bump(NEW.group_id, 0, 1, 0, members);
+    ELSE
+        SELECT count(*) INTO members FROM users WHERE group_id = OLD.group_id;
+        PERFORM group_analytics_bump(OLD.group_id, 0, -1, 0, -members);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION group_analytics_on_vote() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM group_analytics_bump((SELECT group_id FROM daily_questions WHERE id = NEW.question_id), 0, 0, 1, 0);
+    ELSE
+        PERFORM group_analytics_bump((SELECT group_id FROM daily_questions WHERE id = OLD.question_id), 0, 0, -1, 0);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_group_analytics_user ON users;
+CREATE TRIGGER trg_group_analytics_user AFTER INSERT OR DELETE ON users
+    FOR EACH ROW EXECUTE FUNCTION group_analytics_on_user();
+
+DROP TRIGGER IF EXISTS trg_group_analytics_question ON daily_questions;
+CREATE TRIGGER trg_group_analytics_question AFTER INSERT OR DELETE ON daily_questions
+    FOR EACH ROW EXECUTE FUNCTION group_analytics_on_question();
+
+DROP TRIGGER IF EXISTS trg_group_analytics_vote ON votes;
+CREATE TRIGGER trg_group_analytics_vote AFTER INSERT OR DELETE ON votes
+    FOR EACH ROW EXECUTE FUNCTION group_analytics_on_vote();
+"""
+
+
+def upgrade() -> None:
+    # Numerator/denominator for the participation rate
+    op.add_column('group_analytics', sa.Column('participating_user_days', sa.Integer(), nullable=True, server_default='0'))
+    op.add_column('group_analytics', sa.Column('eligible_user_days', sa.Integer(), nullable=True, server_default='0'))
+
+    # The table was never written by the app; rebuild it from current data, one row per group
+    op.execute('DELETE FROM group_analytics')
+    op.create_unique_constraint('group_analytics_group_id_key', 'group_analytics', ['group_id'])
+    op.execute("""
+        INSERT INTO group_analytics (
+            group_id, total_members, total_questions_created, total_votes_cast,
+            participating_user_days, eligible_user_days, average_participation_rate, last_updated
+        )
+        SELECT g.id, m.members, q.questions, v.votes, v.votes, q.questions * m.members,
+               CASE WHEN q.questions * m.members > 0 THEN v.votes::float / (q.questions * m.members) ELSE 0 END,
+               now() AT TIME ZONE 'utc'
+        FROM groups g
+        CROSS JOIN LATERAL (SELECT count(*) AS members FROM users u WHERE u.group_id = g.id) m
+        CROSS JOIN LATERAL (SELECT count(*) AS questions FROM daily_questions dq WHERE dq.group_id = g.id) q
+        CROSS JOIN LATERAL (
+            SELECT count(*) AS votes FROM votes vt JOIN daily_questions dq ON dq.id = vt.question_id
+            WHERE dq.group_id = g.id
+        ) v
+    """)
+
+    op.execute(TRIGGERS_SQL)
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS trg_group_analytics_vote ON votes')
+    op.execute('DROP TRIGGER IF EXISTS trg_group_analytics_question ON daily_questions')
+    op.execute('DROP TRIGGER IF EXISTS trg_group_analytics_user ON users')
+    op.execute('DROP FUNCTION IF EXISTS group_analytics_on_vote()')
+    op.execute('DROP FUNCTION IF EXISTS group_analytics_on_question()')
+    op.execute('DROP FUNCTION IF EXISTS group_analytics_on_user()')
+    op.execute('DROP FUNCTION IF EXISTS group_analytics_bump(integer, integer, integer, integer, integer)')
+    op.drop_constraint('group_analytics_group_id_key', 'group_analytics', type_='unique')
+    op.drop_column('group_analytics', 'eligible_user_days')
+    op.drop_column('group_analytics', 'participating_user_days')
@@ -0,0 +1,47 @@
+"""Store public identifiers as native UUID instead of VARCHAR(36)
+
+Revision ID: 012_native_uuid_columns
+Revises: 011_group_analytics_triggers
+Create Date: 2026-02-09
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '012_native_uuid_columns'
+down_revision = '011_group_analytics_triggers'
+branch_labels = None
+depends_on = None
+
+
+UUID_COLUMNS = [
+    ('question_templates', 'template_id'),
+    ('groups', 'group_id'),
+    ('users', 'user_id'),
+    ('daily_questions', 'question_id'),
+    ('question_sets', 'set_id'),
+    ('votes', 'vote_id'),
+]
+
+
+def upgrade() -> None:
+    # 16-byte native uuid instead of 36-char text; unique indexes are rebuilt by the type change
+    for table, column in UUID_COLUMNS:
+        op.alter_column(
+            table, column,
+            existing_type=sa.String(36),
+            type_=sa.Uuid(),
+            postgresql_using=f'{column}::uuid',
+        )
+
+
+def downgrade() -> None:
+    for table, column in UUID_COLUMNS:
+        op.alter_column(
+            table, column,
+            existing_type=sa.Uuid(),
+            type_=sa.String(36),
+            postgresql_using=f'{column}::text',
+        )
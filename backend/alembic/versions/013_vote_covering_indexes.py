@@ -0,0 +1,38 @@
+"""Covering index for vote tallies and BRIN index on voted_at
+
+Revision ID: 013_vote_covering_indexes
+Revises: 012_native_uuid_columns
+Create Date: 2026-02-11
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '013_vote_covering_indexes'
+down_revision = '012_native_uuid_columns'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # (question_id, answer_key) INCLUDE (user_id) serves tallies and question_id lookups,
+    # making both the single-column index and the partial answer_key index redundant
+    op.create_index(
+        'idx_vote_question_answer',
+        'votes',
+        ['question_id', 'answer_key'],
+        postgresql_include=['user_id'],
+    )
+    op.drop_index('idx_vote_answer_key', table_name='votes')
+    op.drop_index('idx_vote_question', table_name='votes')
+
+    # voted_at grows with insertion order, so a BRIN index is tiny and enough for range scans
+    op.create_index('idx_vote_voted_at_brin', 'votes', ['voted_at'], postgresql_using='brin')
+
+
+def downgrade() -> None:
+    op.drop_index('idx_vote_voted_at_brin', table_name='votes')
+    op.create_index('idx_vote_question', 'votes', ['question_id'])
+    op.execute("CREATE INDEX idx_vote_answer_key ON votes (question_id, answer_key) WHERE answer_key IS NOT NULL")
+    op.drop_index('idx_vote_question_answer', table_name='votes')
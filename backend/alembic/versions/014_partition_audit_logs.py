@@ -0,0 +1,108 @@
+"""Partition audit_logs by month on timestamp
+
+Revision ID: 014_partition_audit_logs
+Revises: 013_vote_covering_indexes
+Create Date: 2026-02-13
+
+"""
+from datetime import date, datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '014_partition_audit_logs'
+down_revision = '013_vote_covering_indexes'
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = "id, admin_id, action, target_type, target_id, before_state, after_state, timestamp, ip_address, reason"
+
+INDEXES = [
+    ('idx_audit_logs_admin_id', '(admin_id)'),
+    ('idx_audit_logs_action', '(action)'),
+    ('idx_audit_logs_timestamp', '(timestamp)'),
+    ('idx_audit_logs_target', '(target_type, target_id)'),
+]
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    # Move the existing table aside; its indexes are recreated on the partitioned parent
+    op.execute('ALTER TABLE audit_logs RENAME TO audit_logs_unpartitioned')
+    op.execute('ALTER TABLE audit_logs_unpartitioned RENAME CONSTRAINT audit_logs_pkey TO audit_logs_unpartitioned_pkey')
+    for name, _ in INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+
+    # The partition key has to be part of the primary key
+    op.execute("""
+        CREATE TABLE audit_logs (
+            id INTEGER NOT NULL DEFAULT nextval('audit_logs_id_seq'),
+            admin_id INTEGER NOT NULL REFERENCES admin_users (id) ON DELETE CASCADE,
+            action VARCHAR(50) NOT NULL,
+            target_type VARCHAR(50) NOT NULL,
+            target_id VARCHAR(255) NOT NULL,
+            before_state JSONB,
+            after_state JSONB,
+            timestamp TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            ip_address INET,
+            reason TEXT,
+            PRIMARY KEY (id, timestamp)
+        ) PARTITION BY RANGE (timestamp)
+    """)
+    op.execute('CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT')
+
+    # One partition per month from the oldest entry through two months ahead
+    oldest = bind.execute(sa.text('SELECT min(timestamp) FROM audit_logs_unpartitioned')).scalar()
+    today = datetime.now(timezone.utc).date()
+    month = (oldest.date() if oldest else today).replace(day=1)
+    last = _next_month(_next_month(today.replace(day=1)))
+    while month <= last:
+        upper = _next_month(month)
+        op.execute(
+            f"CREATE TABLE audit_logs_{month:%Y_%m} PARTITION OF audit_logs "
+            f"FOR VALUES FROM ('{month} 00:00:00+00') TO ('{upper} 00:00:00+00')"
+        )
+        month = upper
+
+    op.execute(f'INSERT INTO audit_logs ({COLUMNS}) SELECT {COLUMNS} FROM audit_logs_unpartitioned')
+    op.execute('ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id')
+    op.execute('DROP TABLE audit_logs_unpartitioned')
+
+    for name, cols in INDEXES:
+        op.execute(f'CREATE INDEX {name} ON audit_logs {cols}')
+
+
+def downgrade() -> None:
+    op.execute('ALTER TABLE audit_logs RENAME TO audit_logs_partitioned')
+    for name, _ in INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+
+    op.execute("""
+        CREATE TABLE audit_logs (
+            id INTEGER NOT NULL DEFAULT nextval('audit_logs_id_seq'),
+            admin_id INTEGER NOT NULL REFERENCES admin_users (id) ON DELETE CASCADE,
+            action VARCHAR(50) NOT NULL,
+            target_type VARCHAR(50) NOT NULL,
+            target_id VARCHAR(255) NOT NULL,
+            before_state JSONB,
+            after_state JSONB,
+            timestamp TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            ip_address INET,
+            reason TEXT,
+            CONSTRAINT audit_logs_pkey PRIMARY KEY (id)
+        )
+    """)
+    op.execute(f'INSERT INTO audit_logs ({COLUMNS}) SELECT {COLUMNS} FROM audit_logs_partitioned')
+    op.execute('ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id')
+    op.execute('DROP TABLE audit_logs_partitioned CASCADE')
+
+    for name, cols in INDEXES:
+        op.execute(f'CREATE INDEX {name} ON audit_logs {cols}')
@@ -0,0 +1,63 @@
+"""Store question_type as a smallint code instead of the questiontypeenum type
+
+Revision ID: 015_question_type_smallint
+Revises: 014_partition_audit_logs
+Create Date: 2026-02-14
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '015_question_type_smallint'
+down_revision = '014_partition_audit_logs'
+branch_labels = None
+depends_on = None
+
+
+# Must match models.QUESTION_TYPE_CODES
+CODES = {
+    'BINARY_VOTE': 1,
+    'SINGLE_CHOICE': 2,
+    'FREE_TEXT': 3,
+    'MEMBER_CHOICE': 4,
+    'DUO_CHOICE': 5,
+}
+
+TABLES = ['question_templates', 'daily_questions']
+
+
+def _to_code_sql() -> str:
+    whens = ' '.join(f"WHEN '{name}' THEN {code}" for name, code in CODES.items())
+    return f'CASE question_type::text {whens} END'
+
+
+def _to_name_sql() -> str:
+    whens = ' '.join(f"WHEN {code} THEN '{name}'" for name, code in CODES.items())
+    return f'(CASE question_type {whens} END)::questiontypeenum'
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.alter_column(
+            table,
+            'question_type',
+            type_=sa.SmallInteger(),
+            postgresql_using=_to_code_sql(),
+        )
+    op.execute('DROP TYPE IF EXISTS questiontypeenum')
+
+
+def downgrade() -> None:
+    op.execute(
+        "CREATE TYPE questiontypeenum AS ENUM "
+        "('BINARY_VOTE', 'SINGLE_CHOICE', 'FREE_TEXT', 'MEMBER_CHOICE', 'DUO_CHOICE')"
+    )
+    for table in TABLES:
+        op.alter_column(
+            table,
+            'question_type',
+            type_=sa.Enum(*CODES, name='questiontypeenum', create_type=False),
+            postgresql_using=_to_name_sql(),
+        )
@@ -0,0 +1,45 @@
+"""Let Postgres fill in created/updated timestamps
+
+Revision ID: 016_timestamp_server_defaults
+Revises: 015_question_type_smallint
+Create Date: 2026-02-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '016_timestamp_server_defaults'
+down_revision = '015_question_type_smallint'
+branch_labels = None
+depends_on = None
+
+
+# Naive columns store UTC wall-clock time
+NAIVE_UTC_COLUMNS = [
+    ('admin_users', 'created_at'),
+    ('question_templates', 'created_at'),
+    ('groups', 'created_at'),
+    ('groups', 'updated_at'),
+    ('group_analytics', 'last_updated'),
+    ('users', 'created_at'),
+    ('daily_questions', 'question_date'),
+    ('daily_questions', 'created_at'),
+    ('question_sets', 'created_at'),
+    ('group_question_sets', 'selected_at'),
+    ('votes', 'voted_at'),
+    ('user_group_streaks', 'updated_at'),
+]
+
+# audit_logs, group_custom_sets and user_device_tokens already default to now()
+
+
+def upgrade() -> None:
+    for table, column in NAIVE_UTC_COLUMNS:
+        op.alter_column(table, column, server_default=sa.text("timezone('utc', now())"))
+
+
+def downgrade() -> None:
+    for table, column in NAIVE_UTC_COLUMNS:
+        op.alter_column(table, column, server_default=None)
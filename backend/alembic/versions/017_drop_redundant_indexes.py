@@ -0,0 +1,30 @@
+"""Drop indexes duplicated by unique constraints
+
+Revision ID: 017_drop_redundant_indexes
+Revises: 016_timestamp_server_defaults
+Create Date: 2026-02-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '017_drop_redundant_indexes'
+down_revision = '016_timestamp_server_defaults'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # groups.invite_code is already backed by its unique constraint's index
+    op.execute('DROP INDEX IF EXISTS idx_group_code')
+    # Same columns as uq_group_date
+    op.execute('DROP INDEX IF EXISTS idx_group_date')
+    # Same columns as uq_user_group_streak (only present on create_all databases)
+    op.execute('DROP INDEX IF EXISTS idx_user_group')
+
+
+def downgrade() -> None:
+    op.create_index('idx_group_date', 'daily_questions', ['group_id', 'question_date'])
+    op.create_index('idx_group_code', 'groups', ['invite_code'])
@@ -0,0 +1,33 @@
+"""Add GIN indexes for JSONB containment filters
+
+Revision ID: 018_jsonb_gin_indexes
+Revises: 017_drop_redundant_indexes
+Create Date: 2026-02-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '018_jsonb_gin_indexes'
+down_revision = '017_drop_redundant_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # jsonb_path_ops only supports @> but is considerably smaller than the default opclass
+    op.create_index(
+        'idx_user_metadata_gin', 'users', ['user_metadata'],
+        postgresql_using='gin', postgresql_ops={'user_metadata': 'jsonb_path_ops'},
+    )
+    op.create_index(
+        'idx_audit_logs_after_state_gin', 'audit_logs', ['after_state'],
+        postgresql_using='gin', postgresql_ops={'after_state': 'jsonb_path_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_audit_logs_after_state_gin', table_name='audit_logs')
+    op.drop_index('idx_user_metadata_gin', table_name='users')
@@ -0,0 +1,36 @@
+"""Store daily_questions.options as JSONB
+
+Revision ID: 019_options_jsonb
+Revises: 018_jsonb_gin_indexes
+Create Date: 2026-02-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '019_options_jsonb'
+down_revision = '018_jsonb_gin_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Values were written with json.dumps, so they cast directly
+    op.alter_column(
+        'daily_questions',
+        'options',
+        type_=postgresql.JSONB(),
+        postgresql_using='options::jsonb',
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'daily_questions',
+        'options',
+        type_=sa.Text(),
+        postgresql_using='options::text',
+    )
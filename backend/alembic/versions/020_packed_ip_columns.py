@@ -0,0 +1,63 @@
+"""Store IP addresses as packed bytes instead of INET
+
+Revision ID: 020_packed_ip_columns
+Revises: 019_options_jsonb
+Create Date: 2026-02-19
+
+"""
+import ipaddress
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '020_packed_ip_columns'
+down_revision = '019_options_jsonb'
+branch_labels = None
+depends_on = None
+
+
+IP_COLUMNS = [
+    ('admin_users', 'last_login_ip'),
+    ('users', 'last_known_ip'),
+    ('audit_logs', 'ip_address'),
+]
+
+
+def _swap_column(table: str, column: str, new_type, convert, select_sql: str, match_sql: str) -> None:
+    """Add a column of new_type, fill it one distinct address at a time, then replace the old one."""
+    bind = op.get_bind()
+    tmp = f'{column}_new'
+    op.add_column(table, sa.Column(tmp, new_type, nullable=True))
+    values = bind.execute(sa.text(
+        f'SELECT DISTINCT {select_sql} FROM {table} WHERE {column} IS NOT NULL'
+    )).scalars().all()
+    for value in values:
+        bind.execute(
+            sa.text(f'UPDATE {table} SET {tmp} = :new WHERE {match_sql} = :old'),
+            {'new': convert(value), 'old': value},
+        )
+    op.drop_column(table, column)
+    op.alter_column(table, tmp, new_column_name=column)
+
+
+def upgrade() -> None:
+    for table, column in IP_COLUMNS:
+        _swap_column(
+            table, column, sa.LargeBinary(),
+            lambda ip: ipaddress.ip_address(ip).packed,
+            select_sql=f'host({column})',
+            match_sql=f'host({column})',
+        )
+
+
+def downgrade() -> None:
+    for table, column in IP_COLUMNS:
+        _swap_column(
+            table, column, postgresql.INET(),
+            lambda packed: str(ipaddress.ip_address(bytes(packed))),
+            select_sql=column,
+            match_sql=column,
+        )
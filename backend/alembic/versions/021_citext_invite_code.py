@@ -0,0 +1,27 @@
+"""Make groups.invite_code case-insensitive with citext
+
+Revision ID: 021_citext_invite_code
+Revises: 020_packed_ip_columns
+Create Date: 2026-02-20
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '021_citext_invite_code'
+down_revision = '020_packed_ip_columns'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS citext')
+    # The unique constraint's index is rebuilt with citext comparison semantics
+    op.alter_column('groups', 'invite_code', type_=postgresql.CITEXT())
+
+
+def downgrade() -> None:
+    op.alter_column('groups', 'invite_code', type_=sa.String(8))
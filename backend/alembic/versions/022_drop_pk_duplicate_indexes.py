@@ -0,0 +1,43 @@
+"""Drop ix_<table>_id indexes that duplicate primary keys
+
+Revision ID: 022_drop_pk_duplicate_indexes
+Revises: 021_citext_invite_code
+Create Date: 2026-02-21
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '022_drop_pk_duplicate_indexes'
+down_revision = '021_citext_invite_code'
+branch_labels = None
+depends_on = None
+
+
+# Only databases bootstrapped with create_all() have these; the migrations never created them
+TABLES = [
+    'admin_users',
+    'question_templates',
+    'groups',
+    'group_analytics',
+    'users',
+    'daily_questions',
+    'question_sets',
+    'votes',
+    'user_group_streaks',
+    'audit_logs',
+    'group_custom_sets',
+    'user_device_tokens',
+]
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.execute(f'DROP INDEX IF EXISTS ix_{table}_id')
+
+
+def downgrade() -> None:
+    # Nothing to restore: the primary key index already covers id
+    pass
@@ -0,0 +1,48 @@
+"""Store every single-select vote as an option index
+
+Revision ID: 024_answer_key_single_select
+Revises: 022_drop_pk_duplicate_indexes
+Create Date: 2026-02-23
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '024_answer_key_single_select'
+down_revision = '022_drop_pk_duplicate_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Binary votes were converted in 010; this covers single choice (2),
+    # member choice (4) and duo choice (5). The first matching option wins,
+    # mirroring options_list.index() in the app.
+    op.execute("""
+        UPDATE votes v
+        SET answer_key = m.idx, answer = NULL
+        FROM (
+            SELECT dq.id AS question_id, o.value, min(o.idx) - 1 AS idx
+            FROM daily_questions dq,
+                 jsonb_array_elements_text(dq.options) WITH ORDINALITY AS o(value, idx)
+            WHERE dq.question_type IN (2, 4, 5)
+              AND NOT COALESCE(dq.allow_multiple, false)
+              AND jsonb_typeof(dq.options) = 'array'
+            GROUP BY dq.id, o.value
+        ) m
+        WHERE v.question_id = m.question_id
+          AND v.answer = m.value
+          AND v.answer_key IS NULL
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        UPDATE votes v
+        SET answer = dq.options->>v.answer_key::int, answer_key = NULL
+        FROM daily_questions dq
+        WHERE v.question_id = dq.id
+          AND v.answer_key IS NOT NULL
+          AND dq.question_type IN (2, 4, 5)
+    """)
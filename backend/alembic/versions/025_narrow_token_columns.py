@@ -0,0 +1,30 @@
+"""Narrow hashed token columns to their real width
+
+Revision ID: 025_narrow_token_columns
+Revises: 024_answer_key_single_select
+Create Date: 2026-02-24
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '025_narrow_token_columns'
+down_revision = '024_answer_key_single_select'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # HMAC-SHA256 hex digests are 64 characters, legacy bcrypt hashes 60
+    op.alter_column('users', 'session_token', type_=sa.String(64))
+    op.alter_column('groups', 'admin_token', type_=sa.String(64))
+    # The unique constraint on session_token already provides this index
+    op.drop_index('idx_user_session', table_name='users')
+
+
+def downgrade() -> None:
+    op.create_index('idx_user_session', 'users', ['session_token'])
+    op.alter_column('groups', 'admin_token', type_=sa.String(255))
+    op.alter_column('users', 'session_token', type_=sa.String(255))
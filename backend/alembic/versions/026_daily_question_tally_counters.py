@@ -0,0 +1,81 @@
+"""Denormalize vote tallies onto daily_questions
+
+Revision ID: 026_daily_question_tally_counters
+Revises: 025_narrow_token_columns
+Create Date: 2026-02-25
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '026_daily_question_tally_counters'
+down_revision = '025_narrow_token_columns'
+branch_labels = None
+depends_on = None
+
+
+TRIGGERS_SQL = """
+CREATE OR REPLACE FUNCTION daily_question_tally_bump(p_question_id integer, p_key smallint, delta integer)
+RETURNS void AS $$
+BEGIN
+    UPDATE daily_questions SET
+        votes_total = votes_total + delta,
+        vote_counts = CASE WHEN p_key IS NULL THEN vote_counts ELSE jsonb_set(
+            vote_counts, ARRAY[p_key::text],
+            to_jsonb(COALESCE((vote_counts->>(p_key::text))::integer, 0) + delta)
+        ) END
+    WHERE id = p_question_id;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION daily_question_tally_on_vote() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM daily_question_tally_bump(OLD.question_id, OLD.answer_key, -1);
+    END IF;
+    IF TG_OP IN ('UPDATE', 'INSERT') THEN
+        PERFORM daily_question_tally_bump(NEW.question_id, NEW.answer_key, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_daily_question_tally ON votes;
+CREATE TRIGGER trg_daily_question_tally AFTER INSERT OR DELETE OR UPDATE OF question_id, answer_key ON votes
+    FOR EACH ROW EXECUTE FUNCTION daily_question_tally_on_vote();
+"""
+
+
+def upgrade() -> None:
+    op.add_column('daily_questions', sa.Column('votes_total', sa.Integer(), nullable=False, server_default=sa.text('0')))
+    op.add_column('daily_questions', sa.Column(
+        'vote_counts', postgresql.JSONB(), nullable=False, server_default=sa.text("'{}'::jsonb")
+    ))
+
+    # Backfill from existing votes before the trigger takes over
+    op.execute("""
+        UPDATE daily_questions dq SET votes_total = t.total, vote_counts = t.counts
+        FROM (
+            SELECT question_id,
+                   sum(n)::integer AS total,
+                   COALESCE(jsonb_object_agg(answer_key::text, n) FILTER (WHERE answer_key IS NOT NULL), '{}'::jsonb) AS counts
+            FROM (
+                SELECT question_id, answer_key, count(*) AS n FROM votes GROUP BY question_id, answer_key
+            ) g
+            GROUP BY question_id
+        ) t
+        WHERE dq.id = t.question_id
+    """)
+
+    op.execute(TRIGGERS_SQL)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_daily_question_tally ON votes")
+    op.execute("DROP FUNCTION IF EXISTS daily_question_tally_on_vote()")
+    op.execute("DROP FUNCTION IF EXISTS daily_question_tally_bump(integer, smallint, integer)")
+    op.drop_column('daily_questions', 'vote_counts')
+    op.drop_column('daily_questions', 'votes_total')
@@ -0,0 +1,41 @@
+"""Drop streak columns from users in favour of user_group_streaks
+
+Revision ID: 027_drop_user_streak_columns
+Revises: 026_daily_question_tally_counters
+Create Date: 2026-02-26
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '027_drop_user_streak_columns'
+down_revision = '026_daily_question_tally_counters'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Streaks are maintained per (user, group); User values are now derived from there
+    op.drop_column('users', 'last_answer_date')
+    op.drop_column('users', 'longest_answer_streak')
+    op.drop_column('users', 'answer_streak')
+
+
+def downgrade() -> None:
+    op.add_column('users', sa.Column('answer_streak', sa.Integer(), nullable=True))
+    op.add_column('users', sa.Column('longest_answer_streak', sa.Integer(), nullable=True))
+    op.add_column('users', sa.Column('last_answer_date', sa.DateTime(), nullable=True))
+    op.execute("""
+        UPDATE users u SET
+            answer_streak = COALESCE(s.current_streak, 0),
+            longest_answer_streak = COALESCE(s.longest_streak, 0),
+            last_answer_date = s.last_answer_date
+        FROM (
+            SELECT user_id, max(current_streak) AS current_streak,
+                   max(longest_streak) AS longest_streak, max(last_answer_date) AS last_answer_date
+            FROM user_group_streaks GROUP BY user_id
+        ) s
+        WHERE s.user_id = u.id
+    """)
@@ -0,0 +1,27 @@
+"""Drop the standalone daily_questions.question_date index
+
+Revision ID: 028_drop_question_date_index
+Revises: 027_drop_user_streak_columns
+Create Date: 2026-02-27
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '028_drop_question_date_index'
+down_revision = '027_drop_user_streak_columns'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Every date lookup is scoped to a group and served by uq_group_date
+    # (only present on create_all databases)
+    op.execute('DROP INDEX IF EXISTS ix_daily_questions_question_date')
+
+
+def downgrade() -> None:
+    # Not recreated: databases built from migrations never had it
+    pass
@@ -1,4 +1,4 @@
-from models import AdminUser, hash_password
+from models import ADMIN_BCRYPT_ROUNDS, AdminUser, hash_password
 from database import SessionLocal
 
 # Run this script once to create the initial admin user
@@ -24,7 +24,7 @@ def main():
 
     admin = AdminUser(
         username=username,
-        password_hash=hash_password(password),
+        password_hash=hash_password(password, rounds=ADMIN_BCRYPT_ROUNDS),
         totp_secret=None,
         totp_enabled=False,
         is_active=True
@@ -1,5 +1,7 @@
 # ============= Standard Library Imports =============
+import asyncio
 import base64
+import hmac
 import io
 import json
 import logging
@@ -9,67 +11,75 @@ import secrets
 import string
 import threading
 import time
-import uuid as uuid_module
 from contextlib import asynccontextmanager
-from datetime import datetime, date, timezone, timedelta
+from datetime import datetime, date, time as dt_time, timezone, timedelta
 from pathlib import Path
 from typing import Optional, Tuple
 
 # ============= Third-Party Imports =============
-import bcrypt
-import jwt
 import qrcode
 from dotenv import load_dotenv
 from fastapi import FastAPI, Depends, HTTPException, WebSocket, WebSocketDisconnect, Query, Path as PathParam, Request, Header, Body, status, UploadFile, File
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_swagger_ui_html
-from fastapi.responses import JSONResponse, FileResponse, Response
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.responses import JSONResponse, FileResponse, ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from PIL import Image
+from pydantic import ValidationError
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
-from sqlalchemy import func, and_
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, exists, func, and_, or_, select
+from sqlalchemy.orm import Session, selectinload, undefer_group
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.gzip import GZipMiddleware
 
 # ============= Local Imports =============
-from database import engine, get_db, Base, SessionLocal
+from database import engine, get_db, Base, SessionLocal, strict_loading
 from models import (
     Group, User, DailyQuestion, Vote, QuestionTemplate, QuestionSet, QuestionSetTemplate, 
-    GroupQuestionSet, UserGroupStreak, QuestionTypeEnum, AdminUser, AuditLog, GroupCustomSet,
+    GroupQuestionSet, UserGroupStreak, QuestionTypeEnum, QUESTION_TYPES_BY_VALUE, AdminUser, AuditLog, GroupCustomSet,
     UserDeviceToken,
-    hash_password, verify_password, generate_totp_secret, verify_totp
+    hash_password, verify_password, generate_totp_secret, verify_totp, ensure_audit_log_partitions
+)
+from push_notifications import (
+    create_fcm_client, push_service, run_push_task, start_push_service, stop_push_service, warmup_push_service
 )
-from push_notifications import push_service
 from schemas import (
     GroupCreate, GroupResponse, GroupResponsePublic, UserCreate, UserResponse,
-    DailyQuestionCreate, DailyQuestionResponse, VoteCreate, AnswerSubmissionCreate,
+    DailyQuestionCreate, DailyQuestionResponse, DailyQuestionLegacyResponse, VoteCreate, AnswerSubmissionCreate,
     QuestionTemplateResponse, QuestionSetCreate, QuestionSetResponse, GroupQuestionSetsResponse, 
     GroupAssignSetsRequest,
-    AdminLoginRequest, AdminLoginResponse, Admin2FARequest, Admin2FAResponse,
-    DeviceTokenRegister, DeviceTokenResponse, PushNotificationStatus
+    DeviceTokenRegister, DeviceTokenResponse, DeviceTokenListAdapter, PushNotificationStatus
 )
-from seed_defaults import initialize_default_question_set, assign_default_set_to_unassigned_groups
+from seed_defaults import DEFAULT_SET_NAME, initialize_default_question_set, seed_default_question_sets
 from ws_manager import manager
 
 # ============= Load Environment =============
 load_dotenv()
 
 # ============= Token Utility Functions =============
+# Session and admin tokens are 256-bit random values generated by the server,
+# so a keyed SHA-256 is sufficient and, unlike bcrypt, deterministic: the
+# stored hash can be looked up through the column's unique index.
+TOKEN_PEPPER = os.getenv("TOKEN_PEPPER", os.getenv("SECRET_KEY", "your-super-secret-key-change-in-production")).encode('utf-8')
+LEGACY_BCRYPT_PREFIX = "$2"
+
+def is_legacy_token_hash(hashed_token: Optional[str]) -> bool:
+    """True for token hashes written before the switch from bcrypt to HMAC."""
+    return bool(hashed_token) and hashed_token.startswith(LEGACY_BCRYPT_PREFIX)
+
 def verify_token(token: str, hashed_token: str) -> bool:
-    """Verify a plaintext token against its bcrypt hash."""
-    return bcrypt.checkpw(token.encode('utf-8'), hashed_token.encode('utf-8'))
+    """Verify a plaintext token against its stored hash (HMAC, or legacy bcrypt)."""
+    if is_legacy_token_hash(hashed_token):
+        return verify_password(token, hashed_token)
+    return hmac.compare_digest(hash_token(token), hashed_token)
 
 def hash_token(token: str) -> str:
-    """Hash a token using bcrypt for secure storage."""
-    return bcrypt.hashpw(token.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-
-# ============= Admin Auth Config =============
-ADMIN_JWT_SECRET = os.getenv("ADMIN_JWT_SECRET", "supersecretkey")
-ADMIN_JWT_ALGO = "HS256"
-ADMIN_JWT_EXPIRE_MINUTES = 60 * 8  # 8 hours
+    """Hash a token with HMAC-SHA256 for secure storage."""
+    # One-shot digest stays in OpenSSL; no HMAC object is built per call
+    return hmac.digest(TOKEN_PEPPER, token.encode('utf-8'), 'sha256').hex()
 
 # ============= Logging Configuration =============
 # pylint: disable=broad-except,logging-fstring-interpolation
@@ -146,34 +156,6 @@ def get_avatar_url(avatar_filename: Optional[str], base_url: str = "") -> Option
         return None
     return f"{base_url}/uploads/avatars/{avatar_filename}"
 
-security = HTTPBearer()
-
-# ============= Admin Auth Helper Functions =============
-def create_admin_jwt(admin_id: int) -> str:
-    """Create a JWT token for admin authentication."""
-    payload = {
-        "sub": str(admin_id),
-        "exp": datetime.utcnow() + timedelta(minutes=ADMIN_JWT_EXPIRE_MINUTES)
-    }
-    return jwt.encode(payload, ADMIN_JWT_SECRET, algorithm=ADMIN_JWT_ALGO)
-
-def verify_admin_jwt(token: str) -> int:
-    """Verify a JWT token and return the admin ID."""
-    try:
-        payload = jwt.decode(token, ADMIN_JWT_SECRET, algorithms=[ADMIN_JWT_ALGO])
-        return int(payload["sub"])
-    except Exception:
-        raise HTTPException(status_code=401, detail="Invalid or expired admin token")
-
-def get_current_admin(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)) -> AdminUser:
-    """Dependency to get the current authenticated admin."""
-    token = credentials.credentials
-    admin_id = verify_admin_jwt(token)
-    admin = db.query(AdminUser).filter(AdminUser.id == admin_id, AdminUser.is_active == True).first()
-    if not admin:
-        raise HTTPException(status_code=401, detail="Admin not found or inactive")
-    return admin
-
 # ============= Background Scheduler =============
 _scheduler_thread = None
 
@@ -192,19 +174,32 @@ async def lifespan(app: FastAPI):
         startup_tasks_failed.append(f"Database table creation: {e}")
         logging.exception("Database table creation failed")
 
+    ensure_audit_log_partitions(engine)
+
+    # One pooled HTTP client for all FCM traffic, closed on shutdown
+    fcm_client = None
+    if push_service.is_enabled():
+        fcm_client = create_fcm_client()
+        app.state.fcm_client = fcm_client
+        app.state.fcm = await start_push_service(fcm_client)
+        # Warm OAuth/FCM connections in the background; startup does not wait on Google
+        app.state.fcm_warmup = asyncio.create_task(warmup_push_service())
+
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        # Share WebSocket broadcasts across workers; without it they stay in-process
+        try:
+            await manager.start_backplane(redis_url)
+        except Exception as e:
+            startup_tasks_failed.append(f"WebSocket backplane: {e}")
+            logging.exception("WebSocket backplane failed to start")
+
     try:
-        initialize_default_question_set()
-        logging.info("Default question set initialized")
-    except Exception as e:
-        startup_tasks_failed.append(f"Default question set initialization: {e}")
-        logging.exception("initialize_default_question_set failed during startup")
-    
-    try:
-        assign_default_set_to_unassigned_groups()
-        logging.info("Unassigned groups assigned default set")
+        seed_default_question_sets()
+        logging.info("Default question set initialized and assigned to unassigned groups")
     except Exception as e:
-        startup_tasks_failed.append(f"Default set assignment: {e}")
-        logging.exception("assign_default_set_to_unassigned_groups failed during startup")
+        startup_tasks_failed.append(f"Default question set seeding: {e}")
+        logging.exception("seed_default_question_sets failed during startup")
 
     try:
         interval = int(os.getenv("SCHEDULE_INTERVAL_SECONDS", "86400"))
@@ -234,9 +229,14 @@ async def lifespan(app: FastAPI):
     
     # ===== SHUTDOWN =====
     logging.info("DontAskUs Backend shutting down...")
+    await stop_push_service()
+    await manager.stop_backplane()
+    if fcm_client is not None:
+        await fcm_client.aclose()
     # Scheduler thread is daemon, so it will be automatically terminated
     logging.info("DontAskUs Backend shutdown complete")
 
+
 app = FastAPI(
     title="DontAskUs - Real-Time Q&A Platform",
     version="1.0.0",
@@ -244,6 +244,7 @@ app = FastAPI(
     lifespan=lifespan,
     docs_url=None,
     redoc_url=None,
+    default_response_class=ORJSONResponse,
 )
 
 # ============= Static File Serving =============
@@ -357,21 +358,6 @@ async def swagger_dark_css():
         return Response(content=SWAGGER_DARK_CSS, media_type="text/css")
 
 
-@app.get("/docs", include_in_schema=False)
-async def custom_swagger_ui():
-    return get_swagger_ui_html(
-        openapi_url=app.openapi_url,
-        title="DontAskUs API Docs",
-        swagger_js_url="https://cdn.jsdelivr.net/npm/swagger-ui-dist@5/swagger-ui-bundle.js",
-        swagger_css_url="/swagger-ui-dark.css",
-        swagger_ui_parameters={
-            "defaultModelsExpandDepth": -1,
-            "displayRequestDuration": True,
-            "persistAuthorization": True,
-            "syntaxHighlight.theme": "monokai",
-        },
-    )
-
 @app.get("/docs", include_in_schema=False)
 async def custom_swagger_ui():
     return get_swagger_ui_html(
@@ -464,10 +450,24 @@ def _generate_duos(member_names: list[str], max_pairs: int = 5) -> list[str]:
 
 
 # ==================== COMMON LOOKUP HELPERS ====================
+# These lookups run on nearly every request. The statements are built once at
+# import with named bind parameters, so every call reuses the same compiled SQL.
+GROUP_BY_PUBLIC_ID = select(Group).where(Group.group_id == bindparam("group_id"))
+GROUP_BY_INVITE = select(Group).where(Group.invite_code == bindparam("invite_code"))
+USER_BY_PUBLIC_ID = select(User).where(User.user_id == bindparam("user_id"))
+USER_BY_TOKEN = select(User).where(User.session_token == bindparam("token_hash"))
+QUESTION_SET_BY_PUBLIC_ID = select(QuestionSet).where(QuestionSet.set_id == bindparam("set_id"))
+QUESTION_BY_PUBLIC_ID = select(DailyQuestion).where(DailyQuestion.question_id == bindparam("question_id"))
+ACTIVE_QUESTION_FOR_GROUP = select(DailyQuestion).where(
+    DailyQuestion.group_id == bindparam("group_id"),
+    DailyQuestion.is_active == True,
+    DailyQuestion.question_date >= bindparam("start"),
+    DailyQuestion.question_date < bindparam("end"),
+).limit(1)
 
 def get_group_by_id(group_id: str, db: Session) -> Group:
     """Get group by group_id, raise 404 if not found"""
-    group = db.query(Group).filter(Group.group_id == group_id).first()
+    group = db.execute(GROUP_BY_PUBLIC_ID, {"group_id": group_id}).scalar_one_or_none()
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
     return group
@@ -475,7 +475,7 @@ def get_group_by_id(group_id: str, db: Session) -> Group:
 
 def get_user_by_id(user_id: str, db: Session) -> User:
     """Get user by user_id, raise 404 if not found"""
-    user = db.query(User).filter(User.user_id == user_id).first()
+    user = db.execute(USER_BY_PUBLIC_ID, {"user_id": user_id}).scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -483,12 +483,57 @@ def get_user_by_id(user_id: str, db: Session) -> User:
 
 def get_question_set_by_id(set_id: str, db: Session) -> QuestionSet:
     """Get question set by set_id, raise 404 if not found"""
-    qs = db.query(QuestionSet).filter(QuestionSet.set_id == set_id).first()
+    qs = db.execute(QUESTION_SET_BY_PUBLIC_ID, {"set_id": set_id}).scalar_one_or_none()
     if not qs:
         raise HTTPException(status_code=404, detail="Question set not found")
     return qs
 
 
+def _active_question_sets(group_id: int, db: Session) -> list[QuestionSet]:
+    """A group's active question sets with their templates loaded in one extra query"""
+    return (
+        db.query(QuestionSet)
+        .join(GroupQuestionSet, GroupQuestionSet.question_set_id == QuestionSet.id)
+        .filter(GroupQuestionSet.group_id == group_id, GroupQuestionSet.is_active == True)
+        .options(selectinload(QuestionSet.templates), *strict_loading())
+        .all()
+    )
+
+
+def _find_question_by_id(question_id: str, db: Session) -> Optional[DailyQuestion]:
+    """Get daily question by public question_id, or None"""
+    return db.execute(QUESTION_BY_PUBLIC_ID, {"question_id": question_id}).scalar_one_or_none()
+
+
+def _day_bounds(day: date) -> Tuple[datetime, datetime]:
+    """Return the half-open [start, end) range covering a UTC calendar day.
+
+    question_date is stored as naive UTC. Comparing the bare column against a
+    range (instead of func.date(question_date) == day) lets Postgres use the
+    (group_id, question_date) indexes.
+    """
+    start = datetime.combine(day, dt_time.min)
+    return start, start + timedelta(days=1)
+
+
+def _todays_question_filter(group_id: int, today: date):
+    """Filter clause matching a group's question(s) dated `today`."""
+    start, end = _day_bounds(today)
+    return and_(
+        DailyQuestion.group_id == group_id,
+        DailyQuestion.question_date >= start,
+        DailyQuestion.question_date < end,
+    )
+
+
+def _find_active_question_for_day(group_id: int, day: date, db: Session) -> Optional[DailyQuestion]:
+    """Get the group's active question for `day`, or None"""
+    start, end = _day_bounds(day)
+    return db.execute(
+        ACTIVE_QUESTION_FOR_GROUP, {"group_id": group_id, "start": start, "end": end}
+    ).scalar_one_or_none()
+
+
 def _generate_qr_code(data: str) -> str:
     """Generate QR code and return as base64 data URL"""
     qr = qrcode.QRCode(
@@ -509,22 +554,75 @@ def _generate_qr_code(data: str) -> str:
     
     return f"data:image/png;base64,{img_str}"
 
-def _get_vote_counts(question_id: int, db: Session) -> tuple:
-    """Get vote counts for a question. Returns (count_a, count_b)"""
-    vote_count_a = db.query(Vote).filter(
-        and_(Vote.question_id == question_id, Vote.answer == 'A')
-    ).count()
-    vote_count_b = db.query(Vote).filter(
-        and_(Vote.question_id == question_id, Vote.answer == 'B')
-    ).count()
-    return vote_count_a, vote_count_b
+def _encode_vote_answer(question: DailyQuestion, options_list: list[str], answer: Optional[str]) -> Tuple[Optional[str], Optional[int]]:
+    """Split a validated answer into the (answer, answer_key) values stored on a Vote.
+
+    A single selection from the question's options (binary, single choice,
+    member or duo) is stored as the option's index in answer_key with answer
+    left NULL; multi-select payloads and free text keep their text form.
+    """
+    if (question.question_type != QuestionTypeEnum.FREE_TEXT
+            and not question.allow_multiple
+            and answer in options_list):
+        return None, options_list.index(answer)
+    return answer, None
+
 
+def _decode_vote_answer(answer: Optional[str], answer_key: Optional[int], options_list: list[str]) -> Optional[str]:
+    """Inverse of _encode_vote_answer: the stored answer in its text form."""
+    if answer_key is not None and 0 <= answer_key < len(options_list):
+        return options_list[answer_key]
+    return answer
 
-def _get_option_counts(question_id: int, db: Session) -> dict:
-    """Aggregate counts per answer value, flattening multi-select payloads."""
-    rows = db.query(Vote.answer).filter(Vote.question_id == question_id).all()
+
+def _has_counter_tally(question: DailyQuestion, options_list: list[str]) -> bool:
+    """Whether vote_counts can describe the question (single-select with options)."""
+    return not (question.allow_multiple or question.question_type == QuestionTypeEnum.FREE_TEXT
+                or not options_list)
+
+
+def _counter_tally(question: DailyQuestion, options_list: list[str]) -> Optional[Tuple[dict, int]]:
+    """Read the trigger-maintained counters on the question row.
+
+    Only single-select questions whose votes are all keyed can be answered from
+    vote_counts; anything else returns None so the caller groups votes instead.
+    """
+    if not _has_counter_tally(question, options_list):
+        return None
     counts: dict[str, int] = {}
-    for (raw_answer,) in rows:
+    keyed = 0
+    for key, n in (question.vote_counts or {}).items():
+        idx = int(key)
+        if n and 0 <= idx < len(options_list):
+            counts[options_list[idx]] = counts.get(options_list[idx], 0) + n
+            keyed += n
+    if keyed != (question.votes_total or 0):
+        return None
+    return counts, keyed
+
+
+def _get_vote_tally(question: DailyQuestion, db: Session, options_list: list[str]) -> Tuple[dict, int]:
+    """Return (per-option counts, total votes) for a question, from counters or grouped in SQL."""
+    if _has_counter_tally(question, options_list):
+        # The trigger updates the counters behind the ORM's back, and a long-lived
+        # session (the WebSocket) may hold the row from before the latest votes
+        db.refresh(question, ["votes_total", "vote_counts"])
+    tally = _counter_tally(question, options_list)
+    if tally is not None:
+        return tally
+    rows = db.query(Vote.answer_key, Vote.answer, func.count()).filter(
+        Vote.question_id == question.id
+    ).group_by(Vote.answer_key, Vote.answer).all()
+    return _tally_vote_rows(rows, options_list)
+
+
+def _tally_vote_rows(rows, options_list: list[str]) -> Tuple[dict, int]:
+    """Fold (answer_key, answer, count) groups into option counts, flattening multi-select payloads."""
+    counts: dict[str, int] = {}
+    total = 0
+    for answer_key, raw_answer, n in rows:
+        total += n
+        raw_answer = _decode_vote_answer(raw_answer, answer_key, options_list)
         if raw_answer is None:
             continue
         parsed = _parse_vote_answer(raw_answer)
@@ -533,11 +631,11 @@ def _get_option_counts(question_id: int, db: Session) -> dict:
                 if item is None:
                     continue
                 key = str(item)
-                counts[key] = counts.get(key, 0) + 1
+                counts[key] = counts.get(key, 0) + n
         else:
             key = str(parsed)
-            counts[key] = counts.get(key, 0) + 1
-    return counts
+            counts[key] = counts.get(key, 0) + n
+    return counts, total
 
 
 def _parse_vote_answer(raw_answer: Optional[str]):
@@ -599,40 +697,80 @@ def _get_user_by_session(session_token: str, db: Session, auto_refresh: bool = T
     Returns:
         User object if valid, None if invalid or expired
     """
-    # Find all users with potential matching tokens (limited lookup)
-    users = db.query(User).all()  # In production, optimize this with indexed lookup
-    
-    for user in users:
-        # Check if token is expired
-        if user.session_token_expires_at:
-            # Ensure both datetimes are timezone-aware for comparison
-            expires_at = user.session_token_expires_at
-            if expires_at.tzinfo is None:
-                expires_at = expires_at.replace(tzinfo=timezone.utc)
-            if datetime.now(timezone.utc) > expires_at:
-                logging.info(f"Session token expired for user {user.user_id}")
-                return None
-        
-        # Verify token hash
-        if _verify_session_token(session_token, user.session_token):
-            # Auto-refresh: extend session expiry on successful authentication
-            if auto_refresh:
-                new_expiry = datetime.now(timezone.utc) + timedelta(days=SESSION_TOKEN_EXPIRY_DAYS)
-                user.session_token_expires_at = new_expiry
-                db.commit()
-                logging.debug(f"Auto-refreshed session for user {user.user_id}, new expiry: {new_expiry}")
-            return user
-    
-    return None
+    if not session_token:
+        return None
+
+    token_hash = hash_token(session_token)
+    user = db.execute(USER_BY_TOKEN, {"token_hash": token_hash}).scalar_one_or_none()
+
+    if user is None:
+        # Sessions issued before tokens were HMAC-hashed still hold a bcrypt
+        # hash; check those and upgrade the match so the next lookup is indexed.
+        # Stream (id, hash) rows rather than materializing every legacy User.
+        # Expired sessions would be rejected below anyway, so they are never
+        # bcrypt-checked and the legacy set drains within one expiry period.
+        legacy_rows = db.execute(
+            select(User.id, User.session_token)
+            .where(User.session_token.like(f"{LEGACY_BCRYPT_PREFIX}%"))
+            .where(or_(
+                User.session_token_expires_at.is_(None),
+                User.session_token_expires_at > datetime.now(timezone.utc),
+            ))
+            .execution_options(yield_per=1000)
+        )
+        matched_id = None
+        for candidate_id, candidate_hash in legacy_rows:
+            if _verify_session_token(session_token, candidate_hash):
+                matched_id = candidate_id
+                break
+        legacy_rows.close()
+        if matched_id is not None:
+            user = db.get(User, matched_id)
+            user.session_token = hash_token(session_token)
+            db.commit()
+        if user is None:
+            return None
 
-def _get_user_vote(user_id: int, question_id: int, db: Session) -> Optional[str]:
+    # Check if token is expired
+    if user.session_token_expires_at:
+        # Ensure both datetimes are timezone-aware for comparison
+        expires_at = user.session_token_expires_at
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        if datetime.now(timezone.utc) > expires_at:
+            logging.info(f"Session token expired for user {user.user_id}")
+            return None
+
+    # Auto-refresh: extend session expiry on successful authentication
+    if auto_refresh:
+        new_expiry = datetime.now(timezone.utc) + timedelta(days=SESSION_TOKEN_EXPIRY_DAYS)
+        user.session_token_expires_at = new_expiry
+        db.commit()
+        logging.debug(f"Auto-refreshed session for user {user.user_id}, new expiry: {new_expiry}")
+    return user
+
+def _leaderboard_rows(group_id: int, db: Session):
+    """Group members ordered by current then longest streak, as plain rows"""
+    answer_streak = User.answer_streak.label("answer_streak")
+    longest_streak = User.longest_answer_streak.label("longest_answer_streak")
+    return db.execute(
+        select(
+            User.display_name, User.color_avatar, User.avatar_filename,
+            answer_streak, longest_streak,
+        )
+        .where(User.group_id == group_id)
+        .order_by(answer_streak.desc(), longest_streak.desc())
+    ).all()
+
+
+def _get_user_vote(user_id: int, question_id: int, db: Session, options_list: list[str]) -> Optional[str]:
     """Get user's vote answer for a question"""
     vote = db.query(Vote).filter(
         and_(Vote.question_id == question_id, Vote.user_id == user_id)
     ).first()
     if not vote:
         return None
-    return _parse_vote_answer(vote.answer)
+    return _parse_vote_answer(_decode_vote_answer(vote.answer, vote.answer_key, options_list))
 
 
 def _get_user_group_streak(user_id: int, group_id: int, db: Session) -> UserGroupStreak:
@@ -679,17 +817,45 @@ def require_group_admin(group_id: str = PathParam(...), x_admin_token: Optional[
     if not x_admin_token:
         raise HTTPException(status_code=401, detail="Admin token required in 'X-Admin-Token' header")
     
-    group = db.query(Group).filter(Group.group_id == group_id).first()
+    group = db.execute(GROUP_BY_PUBLIC_ID, {"group_id": group_id}).scalar_one_or_none()
     if not group:
         raise HTTPException(status_code=401, detail="Invalid admin token")
     
     # Verify admin token hash
-    if not verify_token(x_admin_token, group.admin_token):
+    if not group.admin_token or not verify_token(x_admin_token, group.admin_token):
         raise HTTPException(status_code=401, detail="Invalid admin token")
+
+    if is_legacy_token_hash(group.admin_token):
+        group.admin_token = hash_token(x_admin_token)
+        db.commit()
     
     return group
 
 
+
+def json_body(model):
+    """Dependency that validates a JSON request body straight from the raw bytes.
+
+    `model_validate_json` parses and validates in a single pass, skipping the
+    intermediate dict FastAPI would otherwise build with `json.loads`.
+    Pair with `openapi_extra=json_body_openapi(model)` to keep the docs.
+    """
+    async def parse(request: Request):
+        try:
+            return model.model_validate_json(await request.body())
+        except ValidationError as exc:
+            raise RequestValidationError(
+                [{**err, "loc": ("body", *err["loc"])} for err in exc.errors(include_url=False)]
+            ) from exc
+    return parse
+
+
+def json_body_openapi(model) -> dict:
+    """OpenAPI request body for an endpoint that parses `model` via `json_body`."""
+    schema = model.model_json_schema(ref_template="#/components/schemas/{model}")
+    schema.pop("$defs", None)
+    return {"requestBody": {"required": True, "content": {"application/json": {"schema": schema}}}}
+
 ## Seeding moved to seed_defaults.initialize_default_question_set
 
 
@@ -709,25 +875,13 @@ def create_daily_questions_for_today():
         for group in groups:
             # Skip if question exists for today
             existing = db.query(DailyQuestion).filter(
-                and_(DailyQuestion.group_id == group.id, func.date(DailyQuestion.question_date) == today)
+                _todays_question_filter(group.id, today)
             ).first()
             if existing:
                 continue
 
             # Collect templates from active sets
-            assigned = db.query(GroupQuestionSet).filter(
-                GroupQuestionSet.group_id == group.id, 
-                GroupQuestionSet.is_active == True
-            ).all()
-            template_candidates = []
-            for a in assigned:
-                s = db.get(QuestionSet, a.question_set_id)
-                if not s:
-                    continue
-                for assoc in db.query(QuestionSetTemplate).filter(QuestionSetTemplate.question_set_id == s.id).all():
-                    t = db.get(QuestionTemplate, assoc.template_id)
-                    if t:
-                        template_candidates.append(t)
+            template_candidates = [t for s in _active_question_sets(group.id, db) for t in s.templates]
 
             # Fallback to any public template if none assigned
             if not template_candidates:
@@ -818,7 +972,7 @@ def create_daily_questions_for_today():
                 question_text=tmpl.question_text,
                 option_a=option_a,
                 option_b=option_b,
-                options=json.dumps(options_list) if options_list else None,
+                options=options_list or None,
                 question_type=tmpl.question_type,
                 allow_multiple=getattr(tmpl, "allow_multiple", False),
                 is_active=True
@@ -837,13 +991,13 @@ def create_daily_questions_for_today():
                 try:
                     # Get the question we just created
                     question = db.query(DailyQuestion).filter(
-                        and_(DailyQuestion.group_id == group.id, func.date(DailyQuestion.question_date) == today)
+                        _todays_question_filter(group.id, today)
                     ).first()
                     if not question:
                         continue
                     
                     # Get device tokens for all active group members (not suspended)
-                    group_user_ids = [m.id for m in db.query(User).filter(User.group_id == group.id, User.is_suspended == False).all()]
+                    group_user_ids = db.execute(select(User.id).where(User.group_id == group.id, User.is_suspended == False)).scalars().all()
                     device_tokens = db.query(UserDeviceToken).filter(
                         UserDeviceToken.user_id.in_(group_user_ids),
                         UserDeviceToken.is_active == True
@@ -851,14 +1005,14 @@ def create_daily_questions_for_today():
                     
                     if device_tokens:
                         tokens = [dt.token for dt in device_tokens]
-                        import asyncio
-                        # Run async notification in sync context
-                        asyncio.run(
+                        # Hand the send to the app loop that owns the FCM client
+                        run_push_task(
                             push_service.send_daily_question_notification(
                                 tokens=tokens,
                                 group_name=group.name,
                                 question_preview=question.question_text[:100]
-                            )
+                            ),
+                            wait=True
                         )
                         logging.info(f"Push notification sent to {len(tokens)} devices for group {group.group_id}")
                 except Exception as e:
@@ -883,6 +1037,7 @@ def _background_scheduler(interval_seconds: int = 86400):
             create_daily_questions_for_today()
         except Exception:
             logging.exception("Scheduled create_daily_questions_for_today call failed in scheduler")
+        ensure_audit_log_partitions(engine)
 
 
 # Scheduler is started in the application's lifespan handler
@@ -890,25 +1045,13 @@ def _background_scheduler(interval_seconds: int = 86400):
 def _create_today_question_for_group(db: Session, group: Group):
     today = datetime.now(timezone.utc).date()
     existing = db.query(DailyQuestion).filter(
-        and_(DailyQuestion.group_id == group.id, func.date(DailyQuestion.question_date) == today)
+        _todays_question_filter(group.id, today)
     ).first()
     if existing:
         return existing
 
     # Collect templates from active sets
-    assigned = db.query(GroupQuestionSet).filter(
-        GroupQuestionSet.group_id == group.id,
-        GroupQuestionSet.is_active == True,
-    ).all()
-    template_candidates = []
-    for a in assigned:
-        s = db.get(QuestionSet, a.question_set_id)
-        if not s:
-            continue
-        for assoc in db.query(QuestionSetTemplate).filter(QuestionSetTemplate.question_set_id == s.id).all():
-            t = db.get(QuestionTemplate, assoc.template_id)
-            if t:
-                template_candidates.append(t)
+    template_candidates = [t for s in _active_question_sets(group.id, db) for t in s.templates]
 
     # Fallback to any public template if none assigned
     if not template_candidates:
@@ -960,7 +1103,7 @@ def _create_today_question_for_group(db: Session, group: Group):
         question_text=tmpl.question_text,
         option_a=option_a,
         option_b=option_b,
-        options=json.dumps(options_list) if options_list else None,
+        options=options_list or None,
         question_type=tmpl.question_type,
         allow_multiple=getattr(tmpl, "allow_multiple", False),
         is_active=True,
@@ -1000,18 +1143,20 @@ def create_group(request: Request, group: GroupCreate, db: Session = Depends(get
 
     # Automatically assign the Default question set to the new group
     try:
-        default_set = db.query(QuestionSet).filter(QuestionSet.name == "Default").first()
-        if not default_set:
+        # Only the id is needed; skip hydrating a QuestionSet
+        default_set_query = select(QuestionSet.id).where(QuestionSet.name == DEFAULT_SET_NAME).limit(1)
+        default_set_id = db.scalar(default_set_query)
+        if default_set_id is None:
             # Ensure it's created (idempotent)
             initialize_default_question_set()
-            default_set = db.query(QuestionSet).filter(QuestionSet.name == "Default").first()
-        if default_set:
-            existing = db.query(GroupQuestionSet).filter(
+            default_set_id = db.scalar(default_set_query)
+        if default_set_id is not None:
+            already_assigned = db.query(exists().where(
                 GroupQuestionSet.group_id == db_group.id,
-                GroupQuestionSet.question_set_id == default_set.id,
-            ).first()
-            if not existing:
-                db.add(GroupQuestionSet(group_id=db_group.id, question_set_id=default_set.id, is_active=True))
+                GroupQuestionSet.question_set_id == default_set_id,
+            )).scalar()
+            if not already_assigned:
+                db.add(GroupQuestionSet(group_id=db_group.id, question_set_id=default_set_id, is_active=True))
                 db.commit()
     except Exception:
         logging.exception("Failed to assign Default question set to new group")
@@ -1030,7 +1175,7 @@ def create_group(request: Request, group: GroupCreate, db: Session = Depends(get
 @limiter.limit("200/minute")
 def get_group_by_code(request: Request, invite_code: str, db: Session = Depends(get_db)):
     """Get group info by invite code (for joining)"""
-    group = db.query(Group).filter(Group.invite_code == invite_code).first()
+    group = db.execute(GROUP_BY_INVITE, {"invite_code": invite_code}).scalar_one_or_none()
     
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
@@ -1073,9 +1218,7 @@ def join_group(request: Request, user: UserCreate, db: Session = Depends(get_db)
     """Join a group with invite code and create user session"""
     
     # Find group by invite code
-    group = db.query(Group).filter(
-        Group.invite_code == user.group_invite_code
-    ).first()
+    group = db.execute(GROUP_BY_INVITE, {"invite_code": user.group_invite_code}).scalar_one_or_none()
     
     if not group:
         raise HTTPException(status_code=404, detail="Group not found. Invalid invite code.")
@@ -1200,7 +1343,14 @@ def get_group_members(request: Request, group_id: str, db: Session = Depends(get
     """Get all members in a group"""
     group = get_group_by_id(group_id, db)
     
-    members = db.query(User).filter(User.group_id == group.id).all()
+    # Plain rows: this list is read-only, so skip building ORM instances
+    members = db.execute(
+        select(
+            User.user_id, User.display_name, User.color_avatar, User.avatar_filename,
+            User.created_at, User.answer_streak.label("answer_streak"),
+            User.longest_answer_streak.label("longest_answer_streak"),
+        ).where(User.group_id == group.id)
+    ).all()
     base_url = str(request.base_url).rstrip('/')
     
     return [
@@ -1218,12 +1368,16 @@ def get_group_members(request: Request, group_id: str, db: Session = Depends(get
 
 # ============= Daily Question Routes =============
 
-@app.post("/api/groups/{group_id}/questions", response_model=DailyQuestionResponse)
+@app.post(
+    "/api/groups/{group_id}/questions",
+    response_model=DailyQuestionResponse,
+    openapi_extra=json_body_openapi(DailyQuestionCreate),
+)
 @limiter.limit("10/minute")
 def create_daily_question(
     request: Request,
     group: Group = Depends(require_group_admin),
-    question: DailyQuestionCreate = None,
+    question: DailyQuestionCreate = Depends(json_body(DailyQuestionCreate)),
     db: Session = Depends(get_db)
 ):
     """Create a new daily question (admin endpoint)"""
@@ -1233,10 +1387,7 @@ def create_daily_question(
     # Check if question already exists for today
     today = datetime.now(timezone.utc).date()
     existing = db.query(DailyQuestion).filter(
-        and_(
-            DailyQuestion.group_id == group.id,
-            func.date(DailyQuestion.question_date) == today
-        )
+        _todays_question_filter(group.id, today)
     ).first()
     
     if existing:
@@ -1245,9 +1396,7 @@ def create_daily_question(
     # Get or default to "Default" question set
     question_set = None
     if question.question_set_id:
-        question_set = db.query(QuestionSet).filter(QuestionSet.set_id == question.question_set_id).first()
-        if not question_set:
-            raise HTTPException(status_code=404, detail="Question set not found")
+        question_set = get_question_set_by_id(question.question_set_id, db)
     else:
         # Default to "Default" set
         question_set = db.query(QuestionSet).filter(QuestionSet.name == "Default").first()
@@ -1291,7 +1440,7 @@ def create_daily_question(
         question_text=question.question_text,
         option_a=option_a,
         option_b=option_b,
-        options=json.dumps(options_list) if options_list else None,
+        options=options_list or None,
         question_type=question.question_type,
         allow_multiple=question.allow_multiple
     )
@@ -1304,7 +1453,7 @@ def create_daily_question(
     if push_service.is_enabled():
         try:
             # Get device tokens for all active group members (not suspended)
-            group_user_ids = [m.id for m in db.query(User).filter(User.group_id == group.id, User.is_suspended == False).all()]
+            group_user_ids = db.execute(select(User.id).where(User.group_id == group.id, User.is_suspended == False)).scalars().all()
             device_tokens = db.query(UserDeviceToken).filter(
                 UserDeviceToken.user_id.in_(group_user_ids),
                 UserDeviceToken.is_active == True
@@ -1312,8 +1461,7 @@ def create_daily_question(
             
             if device_tokens:
                 tokens = [dt.token for dt in device_tokens]
-                import asyncio
-                asyncio.create_task(
+                run_push_task(
                     push_service.send_daily_question_notification(
                         tokens=tokens,
                         group_name=group.name,
@@ -1324,7 +1472,7 @@ def create_daily_question(
         except Exception as e:
             logging.error(f"Failed to send push notifications: {e}")
     
-    options_list_resp = json.loads(db_question.options) if db_question.options else []
+    options_list_resp = db_question.options or []
     
     return DailyQuestionResponse(
         id=db_question.id,
@@ -1397,24 +1545,27 @@ def create_question_set(
 
 @app.get("/api/question-sets")
 def list_public_question_sets(db: Session = Depends(get_db)):
-    sets = db.query(QuestionSet).filter(QuestionSet.is_public == True).all()
+    sets = (
+        db.query(QuestionSet)
+        .filter(QuestionSet.is_public == True)
+        .options(selectinload(QuestionSet.templates), *strict_loading())
+        .all()
+    )
     out = []
     for s in sets:
         templates = []
-        for assoc in db.query(QuestionSetTemplate).filter(QuestionSetTemplate.question_set_id == s.id).all():
-            t = db.get(QuestionTemplate, assoc.template_id)
-            if t:
-                templates.append({
-                    "template_id": t.template_id,
-                    "category": t.category,
-                    "question_text": t.question_text,
-                    "option_a_template": t.option_a_template,
-                    "option_b_template": t.option_b_template,
-                    "question_type": t.question_type.value if hasattr(t.question_type, 'value') else str(t.question_type),
-                        "allow_multiple": getattr(t, "allow_multiple", False),
-                    "is_public": t.is_public,
-                    "created_at": t.created_at
-                })
+        for t in s.templates:
+            templates.append({
+                "template_id": t.template_id,
+                "category": t.category,
+                "question_text": t.question_text,
+                "option_a_template": t.option_a_template,
+                "option_b_template": t.option_b_template,
+                "question_type": t.question_type.value if hasattr(t.question_type, 'value') else str(t.question_type),
+                    "allow_multiple": getattr(t, "allow_multiple", False),
+                "is_public": t.is_public,
+                "created_at": t.created_at
+            })
         out.append({
             "set_id": s.set_id,
             "name": s.name,
@@ -1423,37 +1574,34 @@ def list_public_question_sets(db: Session = Depends(get_db)):
             "templates": templates,
             "created_at": s.created_at
         })
-    return out
+    # Plain dicts of UUIDs and datetimes: orjson encodes them natively, no jsonable_encoder pass
+    return ORJSONResponse(out)
 
 
 @app.get("/api/question-sets/{set_id}")
 def get_question_set(set_id: str, db: Session = Depends(get_db)):
-    qs = db.query(QuestionSet).filter(QuestionSet.set_id == set_id).first()
-    if not qs:
-        raise HTTPException(status_code=404, detail="Question set not found")
+    qs = get_question_set_by_id(set_id, db)
     templates = []
-    for assoc in db.query(QuestionSetTemplate).filter(QuestionSetTemplate.question_set_id == qs.id).all():
-        t = db.get(QuestionTemplate, assoc.template_id)
-        if t:
-            templates.append({
-                "template_id": t.template_id,
-                "category": t.category,
-                "question_text": t.question_text,
-                "option_a_template": t.option_a_template,
-                "option_b_template": t.option_b_template,
-                "question_type": t.question_type.value if hasattr(t.question_type, 'value') else str(t.question_type),
-                "allow_multiple": getattr(t, "allow_multiple", False),
-                "is_public": t.is_public,
-                "created_at": t.created_at
-            })
-    return {
+    for t in qs.templates:
+        templates.append({
+            "template_id": t.template_id,
+            "category": t.category,
+            "question_text": t.question_text,
+            "option_a_template": t.option_a_template,
+            "option_b_template": t.option_b_template,
+            "question_type": t.question_type.value if hasattr(t.question_type, 'value') else str(t.question_type),
+            "allow_multiple": getattr(t, "allow_multiple", False),
+            "is_public": t.is_public,
+            "created_at": t.created_at
+        })
+    return ORJSONResponse({
         "set_id": qs.set_id,
         "name": qs.name,
         "description": qs.description,
         "is_public": qs.is_public,
         "templates": templates,
         "created_at": qs.created_at
-    }
+    })
 
 
 @app.post("/api/groups/{group_id}/question-sets")
@@ -1501,35 +1649,30 @@ def assign_question_sets_to_group(
 @app.get("/api/groups/{group_id}/question-sets", response_model=GroupQuestionSetsResponse)
 def get_group_question_sets(group_id: str, db: Session = Depends(get_db)):
     group = get_group_by_id(group_id, db)
-    assigned = db.query(GroupQuestionSet).filter(GroupQuestionSet.group_id == group.id, GroupQuestionSet.is_active == True).all()
     result_sets = []
-    for a in assigned:
-        s = db.get(QuestionSet, a.question_set_id)
-        if s:
-            # include templates
-            templates = []
-            for assoc in db.query(QuestionSetTemplate).filter(QuestionSetTemplate.question_set_id == s.id).all():
-                t = db.get(QuestionTemplate, assoc.template_id)
-                if t:
-                    templates.append(QuestionTemplateResponse(
-                        template_id=t.template_id,
-                        category=t.category,
-                        question_text=t.question_text,
-                        option_a_template=t.option_a_template,
-                        option_b_template=t.option_b_template,
-                        question_type=t.question_type,
-                        allow_multiple=getattr(t, "allow_multiple", False),
-                        is_public=t.is_public,
-                        created_at=t.created_at
-                    ))
-            result_sets.append(QuestionSetResponse(
-                set_id=s.set_id,
-                name=s.name,
-                description=s.description,
-                is_public=s.is_public,
-                templates=templates,
-                created_at=s.created_at
+    for s in _active_question_sets(group.id, db):
+        # include templates
+        templates = []
+        for t in s.templates:
+            templates.append(QuestionTemplateResponse(
+                template_id=t.template_id,
+                category=t.category,
+                question_text=t.question_text,
+                option_a_template=t.option_a_template,
+                option_b_template=t.option_b_template,
+                question_type=t.question_type,
+                allow_multiple=getattr(t, "allow_multiple", False),
+                is_public=t.is_public,
+                created_at=t.created_at
             ))
+        result_sets.append(QuestionSetResponse(
+            set_id=s.set_id,
+            name=s.name,
+            description=s.description,
+            is_public=s.is_public,
+            templates=templates,
+            created_at=s.created_at
+        ))
     return GroupQuestionSetsResponse(group_id=group.group_id, question_sets=result_sets)
 
 @app.get("/api/groups/{group_id}/questions/today")
@@ -1545,20 +1688,13 @@ def get_todays_question(
     group = get_group_by_id(group_id, db)
     
     today = datetime.now(timezone.utc).date()
-    question = db.query(DailyQuestion).filter(
-        and_(
-            DailyQuestion.group_id == group.id,
-            func.date(DailyQuestion.question_date) == today,
-            DailyQuestion.is_active == True
-        )
-    ).first()
+    question = _find_active_question_for_day(group.id, today, db)
     
     if not question:
         raise HTTPException(status_code=404, detail="No question for today")
     
-    options_list = json.loads(question.options) if question.options else []
-    option_counts = _get_option_counts(question.id, db)
-    total_votes = db.query(func.count(Vote.id)).filter(Vote.question_id == question.id).scalar() or 0
+    options_list = question.options or []
+    option_counts, total_votes = _get_vote_tally(question, db, options_list)
     
     # Get user's vote if authenticated
     user_vote = None
@@ -1567,11 +1703,11 @@ def get_todays_question(
     if session_token:
         user = _get_user_by_session(session_token, db)
         if user:
-            user_vote = _get_user_vote(user.id, question.id, db)
+            user_vote = _get_user_vote(user.id, question.id, db, options_list)
             user_streak = user.answer_streak
             longest_streak = user.longest_answer_streak
     
-    return DailyQuestionResponse(
+    fields = dict(
         id=question.id,
         question_id=question.question_id,
         question_text=question.question_text,
@@ -1586,16 +1722,30 @@ def get_todays_question(
         user_streak=user_streak,
         longest_streak=longest_streak
     )
+    if request.headers.get("X-Legacy-Client"):
+        response = DailyQuestionLegacyResponse(
+            **fields,
+            option_a=question.option_a,
+            option_b=question.option_b,
+            vote_count_a=option_counts.get(options_list[0], 0) if options_list else 0,
+            vote_count_b=option_counts.get(options_list[1], 0) if len(options_list) > 1 else 0,
+        )
+    else:
+        response = DailyQuestionResponse(**fields)
+    return ORJSONResponse(response.model_dump())
 
 # ============= Voting Routes =============
 
-@app.post("/api/groups/{group_id}/questions/{question_id}/answer")
+@app.post(
+    "/api/groups/{group_id}/questions/{question_id}/answer",
+    openapi_extra=json_body_openapi(AnswerSubmissionCreate),
+)
 @limiter.limit("100/minute")
 def submit_answer(
     request: Request,
     group_id: str = PathParam(...),
     question_id: str = PathParam(...),
-    answer: AnswerSubmissionCreate = None,
+    answer: AnswerSubmissionCreate = Depends(json_body(AnswerSubmissionCreate)),
     session_token: Optional[str] = Query(None),
     db: Session = Depends(get_db)
 ):
@@ -1613,13 +1763,11 @@ def submit_answer(
     if user.group_id != group.id:
         raise HTTPException(status_code=403, detail="User not in this group")
     
-    question = db.query(DailyQuestion).filter(
-        DailyQuestion.question_id == question_id
-    ).first()
+    question = _find_question_by_id(question_id, db)
     if not question:
         raise HTTPException(status_code=404, detail="Question not found")
     
-    options_list = json.loads(question.options) if question.options else []
+    options_list = question.options or []
     allow_multiple = bool(getattr(question, "allow_multiple", False))
 
     # Validate answer based on question type
@@ -1644,22 +1792,33 @@ def submit_answer(
                 raise HTTPException(status_code=400, detail="Answer must be one of the available options")
         stored_answer = json.dumps(normalized_answers) if allow_multiple else normalized_answers[0]
     
+    new_answer, new_answer_key = _encode_vote_answer(
+        question, options_list,
+        stored_answer if question.question_type != QuestionTypeEnum.FREE_TEXT else answer.text_answer,
+    )
+
     # Check if user already answered
     existing_vote = db.query(Vote).filter(
         and_(Vote.question_id == question.id, Vote.user_id == user.id)
     ).first()
     
     if existing_vote:
-        # Update existing answer
-        existing_vote.answer = stored_answer if question.question_type != QuestionTypeEnum.FREE_TEXT else answer.text_answer
-        existing_vote.text_answer = answer.text_answer
-        existing_vote.voted_at = datetime.now(timezone.utc)
+        # Re-submitting the same answer (e.g. rapid double taps) is a no-op;
+        # only write when something actually changed.
+        if (existing_vote.answer != new_answer or existing_vote.answer_key != new_answer_key
+                or existing_vote.text_answer != answer.text_answer):
+            existing_vote.answer = new_answer
+            existing_vote.answer_key = new_answer_key
+            existing_vote.text_answer = answer.text_answer
+            existing_vote.voted_at = datetime.now(timezone.utc)
+            db.commit()
     else:
         # Create new answer
         db_vote = Vote(
             question_id=question.id,
             user_id=user.id,
-            answer=stored_answer if question.question_type != QuestionTypeEnum.FREE_TEXT else answer.text_answer,
+            answer=new_answer,
+            answer_key=new_answer_key,
             text_answer=answer.text_answer
         )
         db.add(db_vote)
@@ -1667,11 +1826,9 @@ def submit_answer(
         
         # Update per-group streak
         _update_user_group_streak(user.id, group.id, db)
+        db.commit()
     
-    db.commit()
-    
-    option_counts = _get_option_counts(question.id, db)
-    total_votes = db.query(func.count(Vote.id)).filter(Vote.question_id == question.id).scalar() or 0
+    option_counts, total_votes = _get_vote_tally(question, db, options_list)
     vote_count_a = option_counts.get(options_list[0], 0) if options_list else 0
     vote_count_b = option_counts.get(options_list[1], 0) if len(options_list) > 1 else 0
     
@@ -1715,6 +1872,17 @@ def get_question_history(
     ).order_by(
         DailyQuestion.question_date.desc()
     ).offset(skip).limit(limit).all()
+
+    # Counters cover single-select questions; tally the rest with one grouped query
+    tallies = {q.id: _counter_tally(q, q.options or []) for q in questions}
+    uncounted = [question_pk for question_pk, tally in tallies.items() if tally is None]
+    tally_rows: dict[int, list] = {}
+    if uncounted:
+        grouped = db.query(Vote.question_id, Vote.answer_key, Vote.answer, func.count()).filter(
+            Vote.question_id.in_(uncounted)
+        ).group_by(Vote.question_id, Vote.answer_key, Vote.answer).all()
+        for question_pk, answer_key, raw_answer, n in grouped:
+            tally_rows.setdefault(question_pk, []).append((answer_key, raw_answer, n))
     
     total_count = db.query(DailyQuestion).filter(
         DailyQuestion.group_id == group.id
@@ -1722,11 +1890,10 @@ def get_question_history(
     
     result = []
     for question in questions:
-        options_list = json.loads(question.options) if question.options else []
-        option_counts = _get_option_counts(question.id, db)
+        options_list = question.options or []
+        option_counts, total_votes = tallies[question.id] or _tally_vote_rows(tally_rows.get(question.id, []), options_list)
         vote_count_a = option_counts.get(options_list[0], 0) if options_list else 0
         vote_count_b = option_counts.get(options_list[1], 0) if len(options_list) > 1 else 0
-        total_votes = db.query(func.count(Vote.id)).filter(Vote.question_id == question.id).scalar() or 0
         result.append({
             "question_id": question.question_id,
             "question_text": question.question_text,
@@ -1743,13 +1910,13 @@ def get_question_history(
             "allow_multiple": getattr(question, "allow_multiple", False)
         })
     
-    return {
+    return ORJSONResponse({
         "group_id": group_id,
         "total_count": total_count,
         "skip": skip,
         "limit": limit,
         "questions": result
-    }
+    })
 
 
 # ============= Push Notification Endpoints =============
@@ -1772,12 +1939,17 @@ async def get_push_notification_status() -> PushNotificationStatus:
     )
 
 
-@app.post("/api/users/{user_id}/device-token", response_model=DeviceTokenResponse, tags=["Push Notifications"])
+@app.post(
+    "/api/users/{user_id}/device-token",
+    response_model=DeviceTokenResponse,
+    tags=["Push Notifications"],
+    openapi_extra=json_body_openapi(DeviceTokenRegister),
+)
 @limiter.limit("10/minute")
 async def register_device_token(
     request: Request,
     user_id: str,
-    token_data: DeviceTokenRegister,
+    token_data: DeviceTokenRegister = Depends(json_body(DeviceTokenRegister)),
     session_token: str = Header(..., alias="X-Session-Token"),
     db: Session = Depends(get_db)
 ):
@@ -1816,14 +1988,7 @@ async def register_device_token(
         existing.is_active = True
         db.commit()
         db.refresh(existing)
-        return DeviceTokenResponse(
-            id=existing.id,
-            token=existing.token,
-            platform=existing.platform,
-            device_name=existing.device_name,
-            created_at=existing.created_at,
-            is_active=existing.is_active
-        )
+        return existing
     
     # Create new device token
     device_token = UserDeviceToken(
@@ -1838,14 +2003,7 @@ async def register_device_token(
     
     logging.info(f"Registered device token for user {user_id} on {token_data.platform}")
     
-    return DeviceTokenResponse(
-        id=device_token.id,
-        token=device_token.token,
-        platform=device_token.platform,
-        device_name=device_token.device_name,
-        created_at=device_token.created_at,
-        is_active=device_token.is_active
-    )
+    return device_token
 
 
 @app.delete("/api/users/{user_id}/device-token", tags=["Push Notifications"])
@@ -1906,17 +2064,10 @@ async def list_device_tokens(
         UserDeviceToken.is_active == True
     ).all()
     
-    return [
-        DeviceTokenResponse(
-            id=t.id,
-            token=t.token,
-            platform=t.platform,
-            device_name=t.device_name,
-            created_at=t.created_at,
-            is_active=t.is_active
-        )
-        for t in tokens
-    ]
+    return Response(
+        content=DeviceTokenListAdapter.dump_json(DeviceTokenListAdapter.validate_python(tokens)),
+        media_type="application/json",
+    )
 
 
 # ============= Avatar Upload Endpoints =============
@@ -2067,8 +2218,7 @@ async def websocket_endpoint(
     
     try:
         while True:
-            data = await websocket.receive_text()
-            message = json.loads(data)
+            message = await manager.receive(websocket)
             
             # Handle different message types
             if message.get("type") == "vote":
@@ -2078,13 +2228,11 @@ async def websocket_endpoint(
                 except HTTPException:
                     group = None
                 if group:
-                    question = db.query(DailyQuestion).filter(
-                        DailyQuestion.question_id == question_id
-                    ).first()
+                    question = _find_question_by_id(question_id, db)
                     if question:
                         user = _get_user_by_session(message.get("session_token"), db)
                         if user:
-                            options_list = json.loads(question.options) if question.options else []
+                            options_list = question.options or []
                             allow_multiple = bool(getattr(question, "allow_multiple", False))
 
                             stored_answer = None
@@ -2093,21 +2241,23 @@ async def websocket_endpoint(
 
                             if question.question_type == QuestionTypeEnum.FREE_TEXT:
                                 if not text_answer:
-                                    await websocket.send_text(json.dumps({"error": "text_answer required"}))
+                                    await manager.send(websocket, {"error": "text_answer required"})
                                     continue
                                 stored_answer = text_answer
                             else:
                                 raw_answer = message.get("answer")
                                 normalized_answers = _normalize_answer_submission(raw_answer, allow_multiple)
                                 if not normalized_answers:
-                                    await websocket.send_text(json.dumps({"error": "answer required"}))
+                                    await manager.send(websocket, {"error": "answer required"})
                                     continue
                                 if options_list:
                                     invalid = [a for a in normalized_answers if a not in options_list]
                                     if invalid:
-                                        await websocket.send_text(json.dumps({"error": "invalid option"}))
+                                        await manager.send(websocket, {"error": "invalid option"})
                                         continue
                                 stored_answer = json.dumps(normalized_answers) if allow_multiple else normalized_answers[0]
+
+                            stored_answer, answer_key = _encode_vote_answer(question, options_list, stored_answer)
                             
                             existing_vote = db.query(Vote).filter(
                                 and_(
@@ -2117,23 +2267,26 @@ async def websocket_endpoint(
                             ).first()
                             
                             if existing_vote:
-                                existing_vote.answer = stored_answer
-                                existing_vote.text_answer = text_answer
-                                existing_vote.voted_at = datetime.now(timezone.utc)
+                                if (existing_vote.answer != stored_answer or existing_vote.answer_key != answer_key
+                                        or existing_vote.text_answer != text_answer):
+                                    existing_vote.answer = stored_answer
+                                    existing_vote.answer_key = answer_key
+                                    existing_vote.text_answer = text_answer
+                                    existing_vote.voted_at = datetime.now(timezone.utc)
+                                    db.commit()
                             else:
                                 db_vote = Vote(
                                     question_id=question.id,
                                     user_id=user.id,
                                     answer=stored_answer,
+                                    answer_key=answer_key,
                                     text_answer=text_answer
                                 )
                                 db.add(db_vote)
-                            
-                            db.commit()
+                                db.commit()
                             
                             # Get updated counts
-                            option_counts = _get_option_counts(question.id, db)
-                            total_votes = db.query(func.count(Vote.id)).filter(Vote.question_id == question.id).scalar() or 0
+                            option_counts, total_votes = _get_vote_tally(question, db, options_list)
                             
                             # Broadcast to all users
                             await manager.broadcast_update(group_id, question_id, {
@@ -2148,10 +2301,10 @@ async def websocket_endpoint(
                             })
             
             elif message.get("type") == "ping":
-                await websocket.send_text(json.dumps({
+                await manager.send(websocket, {
                     "type": "pong",
                     "timestamp": datetime.now(timezone.utc).isoformat()
-                }))
+                })
     
     except WebSocketDisconnect:
         manager.disconnect(group_id, question_id, websocket)
@@ -2169,12 +2322,7 @@ def get_leaderboard(
     db: Session = Depends(get_db)
 ):
     """Get group leaderboard by answer streak (admin only)"""
-    members = db.query(User).filter(User.group_id == group.id).all()
-    leaderboard = sorted(
-        members,
-        key=lambda x: (x.answer_streak, x.longest_answer_streak),
-        reverse=True
-    )
+    leaderboard = _leaderboard_rows(group.id, db)
     base_url = str(request.base_url).rstrip('/')
     return [
         {
@@ -2212,12 +2360,7 @@ def get_leaderboard_member(
     if user.group_id != group.id:
         raise HTTPException(status_code=403, detail="User not in this group")
 
-    members = db.query(User).filter(User.group_id == group.id).all()
-    leaderboard = sorted(
-        members,
-        key=lambda x: (x.answer_streak, x.longest_answer_streak),
-        reverse=True,
-    )
+    leaderboard = _leaderboard_rows(group.id, db)
     base_url = str(request.base_url).rstrip('/')
     return [
         {
@@ -2240,16 +2383,13 @@ def get_question_status(
 ):
     """Get question exhaustion status for a group (admin only)"""
     # Get available question templates for this group
-    assigned = db.query(GroupQuestionSet).filter(
-        GroupQuestionSet.group_id == group.id,
-        GroupQuestionSet.is_active == True
-    ).all()
-    available_templates = set()
-    for a in assigned:
-        s = db.get(QuestionSet, a.question_set_id)
-        if s:
-            for assoc in db.query(QuestionSetTemplate).filter(QuestionSetTemplate.question_set_id == s.id).all():
-                available_templates.add(assoc.template_id)
+    available_templates = set(
+        db.execute(
+            select(QuestionSetTemplate.template_id)
+            .join(GroupQuestionSet, GroupQuestionSet.question_set_id == QuestionSetTemplate.question_set_id)
+            .where(GroupQuestionSet.group_id == group.id, GroupQuestionSet.is_active == True)
+        ).scalars()
+    )
     
     # Fallback to public templates if none assigned
     if not available_templates:
@@ -2319,8 +2459,8 @@ def regenerate_todays_question(
 
     # Delete today's existing question if any
     db.query(DailyQuestion).filter(
-        and_(DailyQuestion.group_id == group.id, func.date(DailyQuestion.question_date) == today)
-    ).delete()
+        _todays_question_filter(group.id, today)
+    ).delete(synchronize_session="fetch")
     db.commit()
 
     # Create new question
@@ -2328,9 +2468,8 @@ def regenerate_todays_question(
     if not dq:
         raise HTTPException(status_code=400, detail="Unable to generate today's question (insufficient members or no templates)")
 
-    options_list = json.loads(dq.options) if dq.options else []
-    option_counts = _get_option_counts(dq.id, db)
-    total_votes = db.query(func.count(Vote.id)).filter(Vote.question_id == dq.id).scalar() or 0
+    options_list = dq.options or []
+    option_counts, total_votes = _get_vote_tally(dq, db, options_list)
 
     return DailyQuestionResponse(
         id=dq.id,
@@ -2349,8 +2488,7 @@ def regenerate_todays_question(
 from admin_auth import (
     authenticate_admin, verify_admin_totp, generate_temp_token, verify_temp_token,
     generate_access_token, generate_refresh_token, get_current_admin, get_admin_from_refresh_token,
-    record_successful_login, log_admin_action, AdminAuthError, get_totp_secret, get_totp_uri,
-    hash_password, verify_password
+    record_successful_login, log_admin_action, AdminAuthError, get_totp_secret, get_totp_uri
 )
 from admin_schemas import (
     AdminLoginRequest, AdminLoginResponse, AdminTOTPVerifyRequest, AdminTokenResponse,
@@ -2424,7 +2562,8 @@ async def admin_login(request: AdminLoginRequest, request_obj: Request, x_forwar
     ip_address = extract_client_ip(request_obj, x_forwarded_for)
     
     try:
-        admin = authenticate_admin(request.username, request.password, ip_address, db)
+        # bcrypt takes ~100ms at cost 12; keep it off the event loop
+        admin = await run_in_threadpool(authenticate_admin, request.username, request.password, ip_address, db)
     except AdminAuthError as e:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
     
@@ -2537,11 +2676,11 @@ async def change_admin_password(
     ip_address = extract_client_ip(request_obj, x_forwarded_for) if request_obj else "unknown"
     
     # Verify current password
-    if not verify_password(request.current_password, admin.password_hash):
+    if not await run_in_threadpool(verify_password, request.current_password, admin.password_hash):
         raise HTTPException(status_code=400, detail="Current password is incorrect")
     
     # Generate new hash
-    new_hash = hash_password(request.new_password)
+    new_hash = await run_in_threadpool(hash_password, request.new_password)
     
     # Use direct SQL update to ensure it commits properly
     try:
@@ -2745,8 +2884,7 @@ async def disable_totp(request: dict, admin: AdminUser = Depends(get_current_adm
     if not password:
         raise HTTPException(status_code=400, detail="Password required to disable TOTP")
     
-    from admin_auth import verify_password
-    if not verify_password(password, admin.password_hash):
+    if not await run_in_threadpool(verify_password, password, admin.password_hash):
         raise HTTPException(status_code=401, detail="Invalid password")
     
     # Disable TOTP
@@ -2847,7 +2985,7 @@ async def list_all_users(
         query = query.filter(User.is_suspended == True)
     
     total = query.count()
-    users = query.order_by(User.created_at.desc()).limit(limit).offset(offset).all()
+    users = query.options(selectinload(User.group), undefer_group("streak"), *strict_loading()).order_by(User.created_at.desc()).limit(limit).offset(offset).all()
     
     return {
         "users": [
@@ -2976,12 +3114,19 @@ async def list_all_groups(
     """
     List all groups with member counts.
     """
-    groups = db.query(Group).order_by(Group.created_at.desc()).limit(limit).offset(offset).all()
+    groups = db.query(Group).options(*strict_loading()).order_by(Group.created_at.desc()).limit(limit).offset(offset).all()
     total = db.query(func.count(Group.id)).scalar()
+
+    member_counts = dict(
+        db.query(User.group_id, func.count(User.id))
+        .filter(User.group_id.in_([g.id for g in groups]))
+        .group_by(User.group_id)
+        .all()
+    ) if groups else {}
     
     group_list = []
     for g in groups:
-        member_count = db.query(func.count(User.id)).filter(User.group_id == g.id).scalar() or 0
+        member_count = member_counts.get(g.id, 0)
         group_list.append({
             "id": g.id,
             "group_id": g.group_id,
@@ -3222,11 +3367,10 @@ async def create_private_question_set(
             raise HTTPException(status_code=400, detail=f"Question {idx + 1}: text is required")
         
         # Validate question type
-        valid_types = ["binary_vote", "single_choice", "free_text", "member_choice", "duo_choice"]
-        if q_type not in valid_types:
+        if q_type not in QUESTION_TYPES_BY_VALUE:
             raise HTTPException(
                 status_code=400,
-                detail=f"Question {idx + 1}: invalid question_type. Must be one of {valid_types}"
+                detail=f"Question {idx + 1}: invalid question_type. Must be one of {list(QUESTION_TYPES_BY_VALUE)}"
             )
         
         # Validate options for choice-based questions
@@ -3238,7 +3382,7 @@ async def create_private_question_set(
         
         template = QuestionTemplate(
             text=q_text,
-            question_type=QuestionTypeEnum[q_type.upper()],
+            question_type=QUESTION_TYPES_BY_VALUE[q_type],
             set_id=question_set.id
         )
         db.add(template)
@@ -3481,8 +3625,7 @@ async def update_private_question_set(
             if not q_text:
                 raise HTTPException(status_code=400, detail=f"Question {idx + 1}: text is required")
             
-            valid_types = ["binary_vote", "single_choice", "free_text", "member_choice", "duo_choice"]
-            if q_type not in valid_types:
+            if q_type not in QUESTION_TYPES_BY_VALUE:
                 raise HTTPException(
                     status_code=400,
                     detail=f"Question {idx + 1}: invalid question_type"
@@ -3490,7 +3633,7 @@ async def update_private_question_set(
             
             template = QuestionTemplate(
                 text=q_text,
-                question_type=QuestionTypeEnum[q_type.upper()],
+                question_type=QUESTION_TYPES_BY_VALUE[q_type],
                 set_id=set_id
             )
             db.add(template)
@@ -1,34 +1,155 @@
 
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey, UniqueConstraint, Index, Float, Enum, JSON
-from sqlalchemy.dialects.postgresql import INET, JSONB
-from sqlalchemy.orm import relationship
-from datetime import datetime, timezone
+from sqlalchemy import DDL, event, func, select, TypeDecorator, Column, Integer, SmallInteger, LargeBinary, String, Uuid, DateTime, Text, Boolean, ForeignKey, UniqueConstraint, Index, Float, JSON, text
+from sqlalchemy.dialects.postgresql import CITEXT, JSONB, insert as pg_insert
+from sqlalchemy.orm import column_property, relationship
+from datetime import datetime, timedelta, timezone
+import logging
+import hashlib
+import hmac
+import ipaddress
+import os
+import secrets
+import threading
+import time
 import uuid
 import enum
+import functools
 import pyotp
 import bcrypt
 from database import Base
 
-
-
-
-def hash_password(password: str) -> str:
+# Timestamps are filled in by Postgres; naive columns hold UTC wall-clock time
+UTC_NOW = func.timezone('utc', func.now())
+
+# Public ids are UUIDv7 (RFC 9562): a millisecond timestamp prefix keeps new rows
+# at the right edge of the unique indexes instead of scattering inserts across
+# random leaf pages. The random tail is drawn 1024 ids at a time instead of one
+# getrandom() per row.
+_UUID_BATCH = 1024
+_UUID_RAND_BYTES = 10
+_uuid_lock = threading.Lock()
+_uuid_pool = b""
+_uuid_offset = 0
+
+
+def _reset_uuid_pool() -> None:
+    # A forked worker must never hand out ids from its parent's buffer
+    global _uuid_pool, _uuid_offset
+    _uuid_pool, _uuid_offset = b"", 0
+
+
+os.register_at_fork(after_in_child=_reset_uuid_pool)
+
+
+def _next_uuid() -> str:
+    """Return a time-ordered (version 7) UUID string using the pooled random buffer."""
+    global _uuid_pool, _uuid_offset
+    with _uuid_lock:
+        if _uuid_offset >= len(_uuid_pool):
+            _uuid_pool, _uuid_offset = os.urandom(_UUID_RAND_BYTES * _UUID_BATCH), 0
+        rand = int.from_bytes(_uuid_pool[_uuid_offset:_uuid_offset + _UUID_RAND_BYTES], "big")
+        _uuid_offset += _UUID_RAND_BYTES
+    # 48-bit unix ms | version 7 | 12 random bits | variant 10 | 62 random bits
+    value = (time.time_ns() // 1_000_000 & 0xFFFFFFFFFFFF) << 80
+    value |= 0x7 << 76 | (rand >> 64 & 0xFFF) << 64
+    value |= 0b10 << 62 | rand & 0x3FFFFFFFFFFFFFFF
+    return str(uuid.UUID(int=value))
+
+
+# bcrypt cost factor for newly created hashes
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Cost for admin accounts created by the bootstrap scripts; lower it to speed up CI/dev
+ADMIN_BCRYPT_ROUNDS = int(os.getenv("ADMIN_BCRYPT_ROUNDS", str(BCRYPT_ROUNDS)))
+
+# Successful bcrypt verifications are remembered briefly so that the same
+# credential presented on consecutive requests does not pay the full KDF
+# cost every time. Entries are keyed by an HMAC under a per-process random
+# key, so neither plaintext nor a reusable digest is kept in memory.
+_VERIFY_CACHE_TTL_SECONDS = 60
+_VERIFY_CACHE_MAX_ENTRIES = 4096
+_verify_cache_key = secrets.token_bytes(32)
+_verify_cache: dict[bytes, float] = {}
+_verify_cache_lock = threading.Lock()  # verify_password runs on threadpool threads
+
+
+def hash_password(password: str, rounds: int = BCRYPT_ROUNDS) -> str:
     """Hash a password for storing in the database."""
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=rounds)).decode('utf-8')
 
 def verify_password(password: str, hashed: str) -> bool:
     """Verify a password against its hash."""
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    key = hmac.new(_verify_cache_key, password.encode('utf-8') + b"|" + hashed.encode('utf-8'), hashlib.sha256).digest()
+    now = time.monotonic()
+    expires_at = _verify_cache.get(key)
+    if expires_at is not None and expires_at > now:
+        return True
+
+    if not bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8')):
+        return False
+
+    with _verify_cache_lock:
+        if len(_verify_cache) >= _VERIFY_CACHE_MAX_ENTRIES:
+            for stale in [k for k, exp in _verify_cache.items() if exp <= now]:
+                _verify_cache.pop(stale, None)
+            if len(_verify_cache) >= _VERIFY_CACHE_MAX_ENTRIES:
+                _verify_cache.clear()
+        _verify_cache[key] = now + _VERIFY_CACHE_TTL_SECONDS
+    return True
 
 def generate_totp_secret() -> str:
     return pyotp.random_base32()
 
+@functools.lru_cache(maxsize=256)
+def _totp_for(secret: str) -> pyotp.TOTP:
+    # One TOTP per enrolled secret instead of re-decoding the base32 secret on every login
+    return pyotp.TOTP(secret)
+
 def verify_totp(token: str, secret: str) -> bool:
-    totp = pyotp.TOTP(secret)
-    return totp.verify(token, valid_window=1)
+    return _totp_for(secret).verify(token, valid_window=1)
+
+
+class GUID(TypeDecorator):
+    """Public id column: native UUID on Postgres, CHAR(32) elsewhere; values are canonical strings.
+
+    Malformed input binds as NULL, so a lookup by a bogus id simply matches nothing
+    instead of raising a database error.
+    """
+    impl = Uuid
+    cache_ok = True
+
+    def __init__(self):
+        super().__init__(as_uuid=False)
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        try:
+            return str(value if isinstance(value, uuid.UUID) else uuid.UUID(str(value)))
+        except ValueError:
+            return None
+
+
+class PackedIP(TypeDecorator):
+    """Stores an IPv4/IPv6 address as its 4- or 16-byte packed form; reads back as a string"""
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        try:
+            return ipaddress.ip_address(value).packed
+        except ValueError:
+            # e.g. "unknown" when the client address could not be determined
+            return None
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else str(ipaddress.ip_address(bytes(value)))
+
+
 class AdminUser(Base):
     __tablename__ = "admin_users"
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     username = Column(String(50), unique=True, nullable=False)
     password_hash = Column(String(255), nullable=False)
     totp_secret = Column(String(32), nullable=True)  # Nullable until TOTP is set up
@@ -36,11 +157,11 @@ class AdminUser(Base):
     temp_token = Column(String(64), nullable=True)  # For 2FA step
     is_active = Column(Boolean, default=True)
     last_login = Column(DateTime, default=None, nullable=True)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime, server_default=UTC_NOW)
     # New fields for login security
     login_attempt_count = Column(Integer, default=0)
     last_login_attempt = Column(DateTime, nullable=True)
-    last_login_ip = Column(INET, nullable=True)
+    last_login_ip = Column(PackedIP, nullable=True)
     is_locked_until = Column(DateTime, nullable=True)  # Lockout timestamp
     
     # Relationships
@@ -56,35 +177,73 @@ class QuestionTypeEnum(enum.Enum):
     DUO_CHOICE = "duo_choice"        # choose one pair (duo) from generated pairs
 
 
+# Stable on-disk codes; append new types, never renumber
+QUESTION_TYPE_CODES = {
+    QuestionTypeEnum.BINARY_VOTE: 1,
+    QuestionTypeEnum.SINGLE_CHOICE: 2,
+    QuestionTypeEnum.FREE_TEXT: 3,
+    QuestionTypeEnum.MEMBER_CHOICE: 4,
+    QuestionTypeEnum.DUO_CHOICE: 5,
+}
+QUESTION_TYPES_BY_CODE = {code: qt for qt, code in QUESTION_TYPE_CODES.items()}
+# Plain dict lookup; avoids Enum.__call__ when resolving incoming strings
+QUESTION_TYPES_BY_VALUE = {qt.value: qt for qt in QuestionTypeEnum}
+
+
+class QuestionTypeCode(TypeDecorator):
+    """Stores QuestionTypeEnum as a SMALLINT code instead of a Postgres ENUM type"""
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if not isinstance(value, QuestionTypeEnum):
+            # Accept enum names ("BINARY_VOTE") as well as values ("binary_vote")
+            value = QUESTION_TYPES_BY_VALUE.get(getattr(value, "value", value)) or QuestionTypeEnum[value]
+        return QUESTION_TYPE_CODES[value]
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else QUESTION_TYPES_BY_CODE[value]
+
+
 class QuestionTemplate(Base):
     __tablename__ = "question_templates"
     
-    id = Column(Integer, primary_key=True, index=True)
-    template_id = Column(String(36), unique=True, default=lambda: str(uuid.uuid4()))
+    id = Column(Integer, primary_key=True)
+    template_id = Column(GUID(), unique=True, default=_next_uuid)
     category = Column(String(50))
     question_text = Column(String(255))
     option_a_template = Column(String(100), nullable=True)
     option_b_template = Column(String(100), nullable=True)
-    question_type = Column(Enum(QuestionTypeEnum), default=QuestionTypeEnum.BINARY_VOTE)
+    question_type = Column(QuestionTypeCode, default=QuestionTypeEnum.BINARY_VOTE)
     allow_multiple = Column(Boolean, default=False)
     is_public = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime, server_default=UTC_NOW)
+
+    question_sets = relationship("QuestionSet", secondary="question_set_templates", back_populates="templates")
+
+
+# citext backs Group.invite_code and must exist before the tables are created
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS citext").execute_if(dialect="postgresql"),
+)
+
 
 class Group(Base):
     __tablename__ = "groups"
-    __table_args__ = (
-        Index('idx_group_code', 'invite_code'),
-    )
     
-    id = Column(Integer, primary_key=True, index=True)
-    group_id = Column(String(36), unique=True, default=lambda: str(uuid.uuid4()))
+    id = Column(Integer, primary_key=True)
+    group_id = Column(GUID(), unique=True, default=_next_uuid)
     name = Column(String(100), index=True)
-    invite_code = Column(String(8), unique=True, index=True)
+    invite_code = Column(CITEXT, unique=True, index=True)  # matched case-insensitively by the index
     qr_data = Column(Text)
-    admin_token = Column(String(255), unique=True)  # Hashed token
+    admin_token = Column(String(64), unique=True)  # HMAC-SHA256 hex (legacy bcrypt hashes are 60)
     creator_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
-    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime, server_default=UTC_NOW)
+    updated_at = Column(DateTime, server_default=UTC_NOW, onupdate=UTC_NOW)
     # New admin fields
     instance_admin_notes = Column(Text, nullable=True)
     total_sets_created = Column(Integer, default=0)
@@ -92,72 +251,231 @@ class Group(Base):
     members = relationship("User", back_populates="group", cascade="all, delete-orphan", foreign_keys="User.group_id")
     daily_questions = relationship("DailyQuestion", back_populates="group", cascade="all, delete-orphan")
     analytics = relationship("GroupAnalytics", back_populates="group", cascade="all, delete-orphan")
-    creator = relationship("User", foreign_keys=[creator_id], backref="created_groups")
+    creator = relationship("User", foreign_keys=[creator_id], back_populates="created_groups")
+    group_question_sets = relationship("GroupQuestionSet", back_populates="group")
+    user_streaks = relationship("UserGroupStreak", back_populates="group")
 
 class GroupAnalytics(Base):
+    """Per-group counters, maintained by database triggers (see GROUP_ANALYTICS_TRIGGERS)."""
     __tablename__ = "group_analytics"
     
-    id = Column(Integer, primary_key=True, index=True)
-    group_id = Column(Integer, ForeignKey("groups.id"))
+    id = Column(Integer, primary_key=True)
+    group_id = Column(Integer, ForeignKey("groups.id"), unique=True)
     total_members = Column(Integer, default=0)
     total_questions_created = Column(Integer, default=0)
     total_votes_cast = Column(Integer, default=0)
+    # participation = votes cast / (members present when each question was created)
+    participating_user_days = Column(Integer, default=0)
+    eligible_user_days = Column(Integer, default=0)
     average_participation_rate = Column(Float, default=0.0)
-    last_updated = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    last_updated = Column(DateTime, server_default=UTC_NOW, onupdate=UTC_NOW)
     
     group = relationship("Group", back_populates="analytics")
 
+    @classmethod
+    def bulk_upsert(cls, session, items: list) -> None:
+        """Write counter rows for many groups in one executemany, overwriting existing rows.
+
+        Each item is a dict keyed by column name and must include group_id.
+        All items must share the same keys, since one executemany statement
+        (and one SET list) serves them all; the caller commits.
+        """
+        if not items:
+            return
+        keys = items[0].keys()
+        if any(item.keys() != keys for item in items):
+            raise ValueError("bulk_upsert items must all have the same keys")
+        stmt = pg_insert(cls.__table__)
+        updated = {
+            col.name: stmt.excluded[col.name]
+            for col in cls.__table__.columns
+            if col.name not in ('id', 'group_id') and col.name in keys
+        }
+        updated['last_updated'] = UTC_NOW
+        session.execute(stmt.on_conflict_do_update(index_elements=['group_id'], set_=updated), items)
+
+    @classmethod
+    def recompute(cls, session, group_id: int) -> dict:
+        """Rebuild one group's counters from source rows in a single round trip.
+
+        Repairs drift in the trigger-maintained values. Vote totals come from the
+        per-question votes_total counters, and eligible user-days are estimated
+        as questions x current members, as in the 011 backfill. The caller commits.
+        """
+        members = select(func.count(User.id)).where(User.group_id == group_id).scalar_subquery()
+        members_n, questions_n, votes_n = session.execute(
+            select(
+                members,
+                func.count(DailyQuestion.id),
+                func.coalesce(func.sum(DailyQuestion.votes_total), 0),
+            ).where(DailyQuestion.group_id == group_id)
+        ).one()
+        eligible = questions_n * members_n
+        item = {
+            'group_id': group_id,
+            'total_members': members_n,
+            'total_questions_created': questions_n,
+            'total_votes_cast': votes_n,
+            'participating_user_days': votes_n,
+            'eligible_user_days': eligible,
+            'average_participation_rate': votes_n / eligible if eligible else 0.0,
+        }
+        cls.bulk_upsert(session, [item])
+        return item
+
+
+# Row triggers on users / daily_questions / votes keep group_analytics current,
+# so dashboards read one row instead of counting votes. Statements are
+# idempotent because create_all runs on every startup.
+GROUP_ANALYTICS_TRIGGERS = """
+CREATE OR REPLACE FUNCTION group_analytics_bump(
+    p_group_id integer, d_members integer, d_questions integer, d_votes integer, d_eligible integer
+) RETURNS void AS $$
+BEGIN
+    IF p_group_id IS NULL THEN
+        RETURN;
+    END IF;
+    UPDATE group_analytics SET
+        total_members = COALESCE(total_members, 0) + d_members,
+        total_questions_created = COALESCE(total_questions_created, 0) + d_questions,
+        total_votes_cast = COALESCE(total_votes_cast, 0) + d_votes,
+        participating_user_days = COALESCE(participating_user_days, 0) + d_votes,
+        eligible_user_days = COALESCE(eligible_user_days, 0) + d_eligible,
+        average_participation_rate = CASE
+            WHEN COALESCE(eligible_user_days, 0) + d_eligible > 0
+            THEN (COALESCE(participating_user_days, 0) + d_votes)::float / (COALESCE(eligible_user_days, 0) + d_eligible)
+            ELSE 0 END,
+        last_updated = now() AT TIME ZONE 'utc'
+    WHERE group_id = p_group_id;
+    -- Only growth creates a row; decrements come from deletes (possibly of the group itself)
+    IF NOT FOUND AND d_members >= 0 AND d_questions >= 0 AND d_votes >= 0 AND d_eligible >= 0 THEN
+        INSERT INTO group_analytics (
+            group_id, total_members, total_questions_created, total_votes_cast,
+            participating_user_days, eligible_user_days, average_participation_rate, last_updated
+        ) VALUES (
+            p_group_id, d_members, d_questions, d_votes, d_votes, d_eligible,
+            CASE WHEN d_eligible > 0 THEN d_votes::float / d_eligible ELSE 0 END,
+            now() AT TIME ZONE 'utc'
+        )
+        ON CONFLICT (group_id) DO NOTHING;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION group_analytics_on_user() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM group_analytics_bump(NEW.group_id, 1, 0, 0, 0);
+    ELSE
+        PERFORM group_analytics_bump(OLD.group_id, -1, 0, 0, 0);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION group_analytics_on_question() RETURNS trigger AS $$
+DECLARE
+    members integer;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT count(*) INTO members FROM users WHERE group_id = NEW.group_id;
+        PERFORM group_analytics_bump(NEW.group_id, 0, 1, 0, members);
+    ELSE
+        SELECT count(*) INTO members FROM users WHERE group_id = OLD.group_id;
+        PERFORM group_analytics_bump(OLD.group_id, 0, -1, 0, -members);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION group_analytics_on_vote() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM group_analytics_bump((SELECT group_id FROM daily_questions WHERE id = NEW.question_id), 0, 0, 1, 0);
+    ELSE
+        PERFORM group_analytics_bump((SELECT group_id FROM daily_questions WHERE id = OLD.question_id), 0, 0, -1, 0);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_group_analytics_user ON users;
+CREATE TRIGGER trg_group_analytics_user AFTER INSERT OR DELETE ON users
+    FOR EACH ROW EXECUTE FUNCTION group_analytics_on_user();
+
+DROP TRIGGER IF EXISTS trg_group_analytics_question ON daily_questions;
+CREATE TRIGGER trg_group_analytics_question AFTER INSERT OR DELETE ON daily_questions
+    FOR EACH ROW EXECUTE FUNCTION group_analytics_on_question();
+
+DROP TRIGGER IF EXISTS trg_group_analytics_vote ON votes;
+CREATE TRIGGER trg_group_analytics_vote AFTER INSERT OR DELETE ON votes
+    FOR EACH ROW EXECUTE FUNCTION group_analytics_on_vote();
+"""
+
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL(GROUP_ANALYTICS_TRIGGERS).execute_if(dialect="postgresql"),
+)
+
+
 class User(Base):
     __tablename__ = "users"
     __table_args__ = (
         UniqueConstraint('group_id', 'session_token', name='uq_group_session'),
         UniqueConstraint('group_id', 'display_name', name='uq_group_display_name'),
-        Index('idx_user_session', 'session_token'),
+        # Containment (@>) filters on metadata flags
+        Index('idx_user_metadata_gin', 'user_metadata', postgresql_using='gin', postgresql_ops={'user_metadata': 'jsonb_path_ops'}),
     )
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(String(36), unique=True, default=lambda: str(uuid.uuid4()))
+    id = Column(Integer, primary_key=True)
+    user_id = Column(GUID(), unique=True, default=_next_uuid)
     group_id = Column(Integer, ForeignKey("groups.id"))
     display_name = Column(String(50))
-    session_token = Column(String(255), unique=True)  # Hashed token
+    session_token = Column(String(64), unique=True)  # HMAC-SHA256 hex (legacy bcrypt hashes are 60)
     session_token_expires_at = Column(DateTime, nullable=True)  # Token expiry
     color_avatar = Column(String(7), default="#3498db")
     avatar_filename = Column(String(255), nullable=True)  # Uploaded avatar filename (e.g., "abc123.webp")
     avatar_uploaded_at = Column(DateTime, nullable=True)  # When avatar was uploaded
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
-    answer_streak = Column(Integer, default=0)
-    longest_answer_streak = Column(Integer, default=0)
-    last_answer_date = Column(DateTime, default=None)
+    created_at = Column(DateTime, server_default=UTC_NOW)
+    # answer_streak / longest_answer_streak / last_answer_date are read from
+    # user_group_streaks (see the column_property block after UserGroupStreak)
     # New admin fields
     is_suspended = Column(Boolean, default=False)
     suspension_reason = Column(Text, nullable=True)
-    last_known_ip = Column(INET, nullable=True)
+    last_known_ip = Column(PackedIP, nullable=True)
     user_metadata = Column(JSONB, nullable=True, default={})
     
     group = relationship("Group", back_populates="members", foreign_keys=[group_id])
     votes = relationship("Vote", back_populates="user", cascade="all, delete-orphan")
     group_streaks = relationship("UserGroupStreak", back_populates="user", cascade="all, delete-orphan")
+    created_groups = relationship("Group", foreign_keys="Group.creator_id", back_populates="creator")
+    device_tokens = relationship("UserDeviceToken", back_populates="user")
 
 class DailyQuestion(Base):
     __tablename__ = "daily_questions"
     __table_args__ = (
         UniqueConstraint('group_id', 'question_date', name='uq_group_date'),
-        Index('idx_group_date', 'group_id', 'question_date'),
+        # Serves the "today's active question" lookup
+        Index('idx_group_date_active', 'group_id', 'question_date', postgresql_where=text('is_active')),
     )
     
-    id = Column(Integer, primary_key=True, index=True)
-    question_id = Column(String(36), unique=True, default=lambda: str(uuid.uuid4()))
+    id = Column(Integer, primary_key=True)
+    question_id = Column(GUID(), unique=True, default=_next_uuid)
     group_id = Column(Integer, ForeignKey("groups.id"))
     template_id = Column(Integer, ForeignKey("question_templates.id"), nullable=True)
     question_text = Column(String(255))
     option_a = Column(String(100), nullable=True)
     option_b = Column(String(100), nullable=True)
-    options = Column(Text, nullable=True)  # JSON-serialized list of answer choices
-    question_type = Column(Enum(QuestionTypeEnum), default=QuestionTypeEnum.BINARY_VOTE)
+    options = Column(JSONB, nullable=True)  # list of answer choices
+    question_type = Column(QuestionTypeCode, default=QuestionTypeEnum.BINARY_VOTE)
     allow_multiple = Column(Boolean, default=False)
-    question_date = Column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+    question_date = Column(DateTime, server_default=UTC_NOW)
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime, server_default=UTC_NOW)
+    # Vote tally maintained by trg_daily_question_tally (see VOTE_TALLY_TRIGGERS)
+    votes_total = Column(Integer, nullable=False, default=0, server_default=text('0'))
+    vote_counts = Column(JSONB, nullable=False, default=dict, server_default=text("'{}'::jsonb"))  # answer_key -> votes
     
     group = relationship("Group", back_populates="daily_questions")
     template = relationship("QuestionTemplate")
@@ -167,12 +485,12 @@ class DailyQuestion(Base):
 class QuestionSet(Base):
     __tablename__ = "question_sets"
 
-    id = Column(Integer, primary_key=True, index=True)
-    set_id = Column(String(36), unique=True, default=lambda: str(uuid.uuid4()))
+    id = Column(Integer, primary_key=True)
+    set_id = Column(GUID(), unique=True, default=_next_uuid)
     name = Column(String(150), index=True)
     description = Column(Text, nullable=True)
     is_public = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime, server_default=UTC_NOW)
     # New ownership fields
     creator_id = Column(Integer, ForeignKey("admin_users.id"), nullable=True)
     created_by_group_id = Column(Integer, ForeignKey("groups.id"), nullable=True)
@@ -181,8 +499,9 @@ class QuestionSet(Base):
     templates = relationship(
         "QuestionTemplate",
         secondary="question_set_templates",
-        backref="question_sets"
+        back_populates="question_sets"
     )
+    group_question_sets = relationship("GroupQuestionSet", back_populates="question_set")
     creator = relationship("AdminUser", foreign_keys=[creator_id])
     created_by_group = relationship("Group", foreign_keys=[created_by_group_id])
 
@@ -202,53 +521,123 @@ class GroupQuestionSet(Base):
     group_id = Column(Integer, ForeignKey("groups.id"))
     question_set_id = Column(Integer, ForeignKey("question_sets.id"))
     is_active = Column(Boolean, default=True)
-    selected_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    selected_at = Column(DateTime, server_default=UTC_NOW)
     # New admin tracking fields
     assigned_by_admin_id = Column(Integer, ForeignKey("admin_users.id"), nullable=True)
     assignment_notes = Column(Text, nullable=True)
 
     # relationships (optional)
-    group = relationship("Group", backref="group_question_sets")
-    question_set = relationship("QuestionSet", backref="group_question_sets")
+    group = relationship("Group", back_populates="group_question_sets")
+    question_set = relationship("QuestionSet", back_populates="group_question_sets")
     assigned_by_admin = relationship("AdminUser", foreign_keys=[assigned_by_admin_id])
 
 class Vote(Base):
     __tablename__ = "votes"
     __table_args__ = (
         UniqueConstraint('question_id', 'user_id', name='uq_question_user'),
-        Index('idx_vote_question', 'question_id'),
+        # Tally lookups by question; also covers plain question_id filters.
+        # answer is unbounded free text, so it stays out of INCLUDE (btree row size limit).
+        Index('idx_vote_question_answer', 'question_id', 'answer_key', postgresql_include=['user_id']),
         Index('idx_vote_user', 'user_id'),
+        Index('idx_vote_voted_at_brin', 'voted_at', postgresql_using='brin'),
     )
     
-    id = Column(Integer, primary_key=True, index=True)
-    vote_id = Column(String(36), unique=True, default=lambda: str(uuid.uuid4()))
+    id = Column(Integer, primary_key=True)
+    vote_id = Column(GUID(), unique=True, default=_next_uuid)
     question_id = Column(Integer, ForeignKey("daily_questions.id"))
     user_id = Column(Integer, ForeignKey("users.id"))
     answer = Column(Text, nullable=True)  # member name, duo label, or option key
+    answer_key = Column(SmallInteger, nullable=True)  # option index for single selections (answer is then NULL)
     text_answer = Column(Text, nullable=True)  # For free-text answers
-    voted_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    voted_at = Column(DateTime, server_default=UTC_NOW)
     
     question = relationship("DailyQuestion", back_populates="votes")
     user = relationship("User", back_populates="votes")
 
+    @classmethod
+    def bulk_cast(cls, session, items: list) -> None:
+        """Insert many votes in one executemany, skipping users who already voted.
+
+        Each item is a dict of column values (question_id, user_id, answer, ...);
+        the caller commits.
+        """
+        if not items:
+            return
+        stmt = pg_insert(cls.__table__).on_conflict_do_nothing(index_elements=['question_id', 'user_id'])
+        session.execute(stmt, items)
+
+
+# Keeps daily_questions.votes_total and the per-option vote_counts current as votes
+# are cast, changed or removed, so results read one row instead of grouping votes.
+VOTE_TALLY_TRIGGERS = """
+CREATE OR REPLACE FUNCTION daily_question_tally_bump(p_question_id integer, p_key smallint, delta integer)
+RETURNS void AS $$
+BEGIN
+    UPDATE daily_questions SET
+        votes_total = votes_total + delta,
+        vote_counts = CASE WHEN p_key IS NULL THEN vote_counts ELSE jsonb_set(
+            vote_counts, ARRAY[p_key::text],
+            to_jsonb(COALESCE((vote_counts->>(p_key::text))::integer, 0) + delta)
+        ) END
+    WHERE id = p_question_id;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION daily_question_tally_on_vote() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM daily_question_tally_bump(OLD.question_id, OLD.answer_key, -1);
+    END IF;
+    IF TG_OP IN ('UPDATE', 'INSERT') THEN
+        PERFORM daily_question_tally_bump(NEW.question_id, NEW.answer_key, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_daily_question_tally ON votes;
+CREATE TRIGGER trg_daily_question_tally AFTER INSERT OR DELETE OR UPDATE OF question_id, answer_key ON votes
+    FOR EACH ROW EXECUTE FUNCTION daily_question_tally_on_vote();
+"""
+
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL(VOTE_TALLY_TRIGGERS).execute_if(dialect="postgresql"),
+)
+
 
 class UserGroupStreak(Base):
     __tablename__ = "user_group_streaks"
     __table_args__ = (
         UniqueConstraint('user_id', 'group_id', name='uq_user_group_streak'),
-        Index('idx_user_group', 'user_id', 'group_id'),
     )
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     group_id = Column(Integer, ForeignKey("groups.id"))
     current_streak = Column(Integer, default=0)
     longest_streak = Column(Integer, default=0)
     last_answer_date = Column(DateTime, nullable=True)
-    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    updated_at = Column(DateTime, server_default=UTC_NOW, onupdate=UTC_NOW)
     
     user = relationship("User", back_populates="group_streaks")
-    group = relationship("Group", backref="user_streaks")
+    group = relationship("Group", back_populates="user_streaks")
+
+
+# Streaks are only written to user_group_streaks; the User-level values are
+# derived on demand. Deferred so session lookups don't pay for the subqueries.
+def _user_streak_summary(agg):
+    return column_property(
+        select(agg).where(UserGroupStreak.user_id == User.id).correlate_except(UserGroupStreak).scalar_subquery(),
+        deferred=True,
+        group="streak",
+    )
+
+
+User.answer_streak = _user_streak_summary(func.coalesce(func.max(UserGroupStreak.current_streak), 0))
+User.longest_answer_streak = _user_streak_summary(func.coalesce(func.max(UserGroupStreak.longest_streak), 0))
+User.last_answer_date = _user_streak_summary(func.max(UserGroupStreak.last_answer_date))
 
 
 class AuditLog(Base):
@@ -259,22 +648,55 @@ class AuditLog(Base):
         Index('idx_audit_logs_action', 'action'),
         Index('idx_audit_logs_timestamp', 'timestamp'),
         Index('idx_audit_logs_target', 'target_type', 'target_id'),
+        Index('idx_audit_logs_after_state_gin', 'after_state', postgresql_using='gin', postgresql_ops={'after_state': 'jsonb_path_ops'}),
+        # Monthly range partitions; see ensure_audit_log_partitions()
+        {'postgresql_partition_by': 'RANGE (timestamp)'},
     )
     
-    id = Column(Integer, primary_key=True, index=True)
+    # Postgres requires the partition key in the primary key
+    id = Column(Integer, primary_key=True, autoincrement=True)
     admin_id = Column(Integer, ForeignKey("admin_users.id"), nullable=False)
     action = Column(String(50), nullable=False)  # e.g., 'token_recovery', 'user_data_change'
     target_type = Column(String(50), nullable=False)  # e.g., 'user', 'group', 'set'
     target_id = Column(String(255), nullable=False)  # UUID or ID of target
     before_state = Column(JSONB, nullable=True)  # Previous state as JSON
     after_state = Column(JSONB, nullable=True)  # New state as JSON
-    timestamp = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
-    ip_address = Column(INET, nullable=True)  # IP of admin making the change
+    timestamp = Column(DateTime(timezone=True), primary_key=True, server_default=func.now(), nullable=False)
+    ip_address = Column(PackedIP, nullable=True)  # IP of admin making the change
     reason = Column(Text, nullable=True)  # Admin's explanation
     
     admin = relationship("AdminUser", back_populates="audit_logs")
 
 
+# Rows outside every monthly partition land here, so inserts never fail
+event.listen(
+    AuditLog.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS audit_logs_default PARTITION OF audit_logs DEFAULT").execute_if(dialect="postgresql"),
+)
+
+
+def ensure_audit_log_partitions(bind, months_ahead: int = 2) -> None:
+    """Create audit_logs partitions for the current month and the next `months_ahead` months.
+
+    Safe to call repeatedly; old months can later be dropped with a plain DROP TABLE.
+    """
+    if bind.dialect.name != "postgresql":
+        return
+    month = datetime.now(timezone.utc).date().replace(day=1)
+    for _ in range(months_ahead + 1):
+        next_month = (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+        try:
+            with bind.begin() as conn:
+                conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS audit_logs_{month:%Y_%m} PARTITION OF audit_logs "
+                    f"FOR VALUES FROM ('{month} 00:00:00+00') TO ('{next_month} 00:00:00+00')"
+                ))
+        except Exception:
+            logging.exception(f"Could not create audit_logs partition for {month:%Y-%m}")
+        month = next_month
+
+
 class GroupCustomSet(Base):
     """Tracks private question sets created by group creators (max 5 per group)."""
     __tablename__ = "group_custom_sets"
@@ -284,11 +706,11 @@ class GroupCustomSet(Base):
         Index('idx_group_custom_sets_creator_id', 'creator_user_id'),
     )
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     set_id = Column(Integer, ForeignKey("question_sets.id"), nullable=False)
     group_id = Column(Integer, ForeignKey("groups.id"), nullable=False)
     creator_user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     question_set = relationship("QuestionSet", foreign_keys=[set_id])
     group = relationship("Group", foreign_keys=[group_id])
@@ -309,14 +731,14 @@ class UserDeviceToken(Base):
         Index('idx_device_tokens_active', 'is_active'),
     )
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     token = Column(String(255), nullable=False)  # FCM device token
     platform = Column(String(20), nullable=False)  # 'ios', 'android', 'web'
     device_name = Column(String(100), nullable=True)  # Optional device identifier
-    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
-    last_used_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now())
     is_active = Column(Boolean, default=True)
     
-    user = relationship("User", backref="device_tokens")
+    user = relationship("User", back_populates="device_tokens")
 
@@ -18,8 +18,12 @@ The FCM_ENABLED environment variable can be set to explicitly enable/disable.
 """
 
 import os
+import functools
+import hashlib
+import importlib.util
 import json
 import logging
+import time
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone
 import asyncio
@@ -36,9 +40,21 @@ try:
 except ImportError:
     logger.info("httpx not installed - push notifications disabled")
 
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+    _json_loads = json.loads
+
+# HTTP/2 needs the optional h2 package (httpx[http2]); fall back to HTTP/1.1 without it
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
 try:
     from google.oauth2 import service_account
-    from google.auth.transport.requests import Request
+    from google.auth import jwt as google_jwt
     GOOGLE_AUTH_AVAILABLE = True
 except ImportError:
     logger.info("google-auth not installed - push notifications disabled")
@@ -58,6 +74,92 @@ FCM_API_URL_TEMPLATE = "https://fcm.googleapis.com/v1/projects/{project_id}/mess
 # OAuth 2.0 scope for FCM
 FCM_SCOPES = ["https://www.googleapis.com/auth/firebase.messaging"]
 
+# Service-account JWT bearer grant (RFC 7523), exchanged at the key's token_uri
+DEFAULT_TOKEN_URI = "https://oauth2.googleapis.com/token"
+JWT_BEARER_GRANT_TYPE = "urn:ietf:params:oauth:grant-type:jwt-bearer"
+
+# Access tokens shared by every FCMServiceV1 in the process, keyed by a SHA-256 of
+# the service-account key: {key: (access_token, expires_at_epoch)}
+_TOKEN_CACHE: Dict[str, tuple] = {}
+
+# Access tokens this close to expiry are refreshed in the background while the
+# current one keeps being served; callers only wait once a token has expired.
+TOKEN_STALE_SECONDS = 300
+
+# Outbound connection pool; broadcasts run one send worker per connection
+FCM_MAX_CONNECTIONS = int(os.getenv("FCM_MAX_CONNECTIONS", "200"))
+FCM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("FCM_MAX_KEEPALIVE_CONNECTIONS", "50"))
+
+# Platform blocks that never vary between sends, shared by every message
+ANDROID_CONFIG = {
+    "priority": "high",
+    "notification": {
+        "channel_id": "daily_questions",
+        "sound": "default"
+    }
+}
+WEBPUSH_CONFIG = {
+    "notification": {
+        "icon": "/icon-192.png"
+    }
+}
+
+# Short-lived key sets below are plain dicts of key -> expiry (time.monotonic()),
+# pruned like the bcrypt verify cache in models.
+def _expiring_has(cache: Dict[Any, float], key: Any, now: float) -> bool:
+    expires_at = cache.get(key)
+    return expires_at is not None and expires_at > now
+
+
+def _expiring_add(cache: Dict[Any, float], key: Any, ttl: float, max_entries: int) -> None:
+    now = time.monotonic()
+    if len(cache) >= max_entries:
+        for stale in [k for k, exp in cache.items() if exp <= now]:
+            cache.pop(stale, None)
+        if len(cache) >= max_entries:
+            cache.clear()
+    cache[key] = now + ttl
+
+
+# Tokens FCM has rejected as unregistered/invalid are skipped for a day so that
+# broadcasts don't keep resending to them before the caller prunes its records.
+_INVALID_TOKEN_TTL_SECONDS = 86400
+_INVALID_TOKEN_MAX_ENTRIES = 100_000
+_invalid_tokens: Dict[str, float] = {}
+
+
+def _is_known_invalid_token(token: str, now: float) -> bool:
+    return _expiring_has(_invalid_tokens, token, now)
+
+
+def _remember_invalid_token(token: str) -> None:
+    _expiring_add(_invalid_tokens, token, _INVALID_TOKEN_TTL_SECONDS, _INVALID_TOKEN_MAX_ENTRIES)
+
+
+# The same notification (token, title, body) is delivered at most once per window,
+# e.g. when the scheduler and a manual question creation overlap. Keys hold a
+# BLAKE2b digest of the text rather than the text itself.
+_DEDUP_WINDOW_SECONDS = 60
+_DEDUP_MAX_ENTRIES = 50_000
+_recent_sends: Dict[tuple, float] = {}
+
+
+def _notification_digest(title: str, body: str) -> bytes:
+    return hashlib.blake2b(f"{title}\0{body}".encode("utf-8"), digest_size=16).digest()
+
+
+def _is_invalid_token_result(result: Dict[str, Any]) -> bool:
+    """Whether a failed send means the device token itself is dead."""
+    if result.get("error_code") == "UNREGISTERED":
+        return True
+    return "not a valid fcm registration token" in str(result.get("error", "")).lower()
+
+
+@functools.lru_cache(maxsize=10_000)
+def _group_topic(group_id: str) -> str:
+    """FCM topic name for a group (topic names may not contain '-')."""
+    return f"group_{group_id.replace('-', '_')}"
+
 
 # ============= Notification Types =============
 class NotificationType:
@@ -68,19 +170,28 @@ class NotificationType:
     STREAK_WARNING = "streak_warning"
 
 
+# Configuration is read once at import, so the answer never changes afterwards
+_PUSH_ENABLED = (
+    FCM_ENABLED and 
+    bool(FCM_PROJECT_ID) and 
+    (bool(GOOGLE_APPLICATION_CREDENTIALS) or bool(FCM_SERVICE_ACCOUNT_JSON)) and
+    HTTPX_AVAILABLE and 
+    GOOGLE_AUTH_AVAILABLE
+)
+
+
 def is_push_enabled() -> bool:
     """Check if push notifications are enabled and configured."""
-    return (
-        FCM_ENABLED and 
-        bool(FCM_PROJECT_ID) and 
-        (bool(GOOGLE_APPLICATION_CREDENTIALS) or bool(FCM_SERVICE_ACCOUNT_JSON)) and
-        HTTPX_AVAILABLE and 
-        GOOGLE_AUTH_AVAILABLE
-    )
+    return _PUSH_ENABLED
 
 
+@functools.lru_cache(maxsize=1)
 def get_push_status() -> Dict[str, Any]:
-    """Get the current push notification configuration status."""
+    """Get the current push notification configuration status.
+    
+    Built once per process (configuration is fixed at import); callers must not
+    mutate the returned dict.
+    """
     return {
         "enabled": is_push_enabled(),
         "api_version": "v1",
@@ -92,6 +203,7 @@ def get_push_status() -> Dict[str, Any]:
     }
 
 
+@functools.lru_cache(maxsize=1)
 def _get_disabled_reason() -> Optional[str]:
     """Get the reason why push notifications are disabled."""
     if not HTTPX_AVAILABLE:
@@ -107,6 +219,26 @@ def _get_disabled_reason() -> Optional[str]:
     return None
 
 
+def reset_push_status_cache() -> None:
+    """Forget the cached status, e.g. after patching configuration in tests."""
+    get_push_status.cache_clear()
+    _get_disabled_reason.cache_clear()
+
+
+def create_fcm_client() -> "httpx.AsyncClient":
+    """Build the pooled HTTP client used for OAuth token exchange and FCM sends."""
+    return httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        # Sends queue for a free connection, so the pool wait matches the read timeout
+        timeout=httpx.Timeout(connect=5.0, read=30.0, write=10.0, pool=30.0),
+        limits=httpx.Limits(
+            max_connections=FCM_MAX_CONNECTIONS,
+            max_keepalive_connections=FCM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=60.0,
+        ),
+    )
+
+
 class FCMServiceV1:
     """
     Firebase Cloud Messaging HTTP v1 API service.
@@ -115,12 +247,19 @@ class FCMServiceV1:
     This is the modern, recommended API with better features and long-term support.
     """
     
-    def __init__(self, project_id: str):
+    def __init__(self, project_id: str, client: Optional["httpx.AsyncClient"] = None):
         self.project_id = project_id
         self.api_url = FCM_API_URL_TEMPLATE.format(project_id=project_id)
-        self._client: Optional[httpx.AsyncClient] = None
+        # Normally the app-wide client from create_fcm_client(), owned by the app lifespan
+        self._client: Optional[httpx.AsyncClient] = client
+        self._owns_client = client is None
         self._credentials = None
+        self._token_uri = DEFAULT_TOKEN_URI
+        self._cache_key: Optional[str] = None
+        self._access_token: Optional[str] = None
         self._credentials_lock = asyncio.Lock()
+        self._token_expiry = 0.0  # time.monotonic() deadline of the current token
+        self._refresh_task: Optional[asyncio.Task] = None
     
     def _load_credentials(self):
         """Load service account credentials."""
@@ -130,19 +269,22 @@ class FCMServiceV1:
         try:
             if FCM_SERVICE_ACCOUNT_JSON:
                 # Load from environment variable (JSON string)
-                service_account_info = json.loads(FCM_SERVICE_ACCOUNT_JSON)
-                self._credentials = service_account.Credentials.from_service_account_info(
-                    service_account_info,
-                    scopes=FCM_SCOPES
-                )
+                raw_info = FCM_SERVICE_ACCOUNT_JSON
             elif GOOGLE_APPLICATION_CREDENTIALS:
                 # Load from file path
-                self._credentials = service_account.Credentials.from_service_account_file(
-                    GOOGLE_APPLICATION_CREDENTIALS,
-                    scopes=FCM_SCOPES
-                )
+                with open(GOOGLE_APPLICATION_CREDENTIALS, encoding="utf-8") as f:
+                    raw_info = f.read()
             else:
                 raise ValueError("No credentials configured")
+            
+            service_account_info = _json_loads(raw_info)
+            self._cache_key = hashlib.sha256(raw_info.encode("utf-8")).hexdigest()
+            
+            self._credentials = service_account.Credentials.from_service_account_info(
+                service_account_info,
+                scopes=FCM_SCOPES
+            )
+            self._token_uri = service_account_info.get("token_uri") or DEFAULT_TOKEN_URI
                 
             logger.info("FCM service account credentials loaded successfully")
             return self._credentials
@@ -151,55 +293,105 @@ class FCMServiceV1:
             logger.error(f"Failed to load FCM credentials: {e}")
             raise
     
+    async def _refresh_token(self) -> None:
+        """Fetch a new access token and record when it expires.
+        
+        The service-account JWT is signed locally and exchanged over the shared
+        async client, so a refresh never blocks a worker thread on network I/O.
+        """
+        credentials = self._load_credentials()
+        now = int(time.time())
+        cached = _TOKEN_CACHE.get(self._cache_key)
+        if cached is not None and cached[1] - now > TOKEN_STALE_SECONDS:
+            # Another service instance in this process already has a fresh token
+            self._access_token = cached[0]
+            self._token_expiry = time.monotonic() + (cached[1] - now)
+            return
+        
+        assertion = google_jwt.encode(credentials.signer, {
+            "iss": credentials.service_account_email,
+            "scope": " ".join(FCM_SCOPES),
+            "aud": self._token_uri,
+            "iat": now,
+            "exp": now + 3600,
+        })
+        client = await self._get_client()
+        response = await client.post(
+            self._token_uri,
+            data={"grant_type": JWT_BEARER_GRANT_TYPE, "assertion": assertion.decode("ascii")}
+        )
+        response.raise_for_status()
+        token_data = _json_loads(response.content)
+        expires_in = int(token_data.get("expires_in", 3600))
+        self._access_token = token_data["access_token"]
+        self._token_expiry = time.monotonic() + expires_in
+        _TOKEN_CACHE[self._cache_key] = (self._access_token, now + expires_in)
+    
+    async def _background_refresh(self) -> None:
+        """Refresh a stale token; failures are retried by the next caller."""
+        try:
+            await self._refresh_token()
+        except Exception as e:
+            logger.warning(f"Background FCM token refresh failed: {e}")
+    
     async def _get_access_token(self) -> str:
-        """Get a valid OAuth 2.0 access token, refreshing if needed."""
+        """Get a valid OAuth 2.0 access token, refreshing if needed.
+        
+        Fresh tokens are returned without taking the lock. A stale token is
+        still returned, with a single background refresh started; only an
+        expired (or missing) token makes callers wait.
+        """
+        if self._access_token:
+            remaining = self._token_expiry - time.monotonic()
+            if remaining > TOKEN_STALE_SECONDS:
+                return self._access_token
+            if remaining > 0:
+                if self._refresh_task is None or self._refresh_task.done():
+                    self._refresh_task = asyncio.create_task(self._background_refresh())
+                return self._access_token
+        
         async with self._credentials_lock:
-            credentials = self._load_credentials()
-            
-            # Check if token needs refresh
-            if not credentials.valid:
-                # Run the blocking refresh in a thread pool
-                loop = asyncio.get_event_loop()
-                await loop.run_in_executor(
-                    None,
-                    lambda: credentials.refresh(Request())
-                )
-            
-            return credentials.token
+            # Another caller may have refreshed while we waited for the lock
+            task = self._refresh_task
+            if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+                await task
+            if not self._access_token or self._token_expiry <= time.monotonic():
+                await self._refresh_token()
+            return self._access_token
     
     async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create the HTTP client."""
-        if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(timeout=30.0)
+        """Get the HTTP client, creating a private one when none was injected."""
+        if self._client is None or (self._owns_client and self._client.is_closed):
+            self._client = create_fcm_client()
+            self._owns_client = True
         return self._client
     
+    async def warmup(self):
+        """Fetch the first access token and leave a keep-alive connection to FCM in the pool."""
+        await self._get_access_token()
+        client = await self._get_client()
+        # messages:send only accepts POST; any response still leaves a warm connection
+        await client.get(self.api_url)
+    
     async def close(self):
-        """Close the HTTP client."""
-        if self._client and not self._client.is_closed:
+        """Close the HTTP client if this service created it."""
+        if self._owns_client and self._client and not self._client.is_closed:
             await self._client.aclose()
     
-    def _build_message(
+    def _build_message_template(
         self,
-        token: str,
         title: str,
         body: str,
         data: Optional[Dict[str, str]] = None,
         badge: Optional[int] = None
     ) -> Dict[str, Any]:
-        """Build a single FCM v1 message payload."""
+        """Build the FCM v1 message shared by every recipient (everything but "token")."""
         message = {
-            "token": token,
             "notification": {
                 "title": title,
                 "body": body
             },
-            "android": {
-                "priority": "high",
-                "notification": {
-                    "channel_id": "daily_questions",
-                    "sound": "default"
-                }
-            },
+            "android": ANDROID_CONFIG,
             "apns": {
                 "payload": {
                     "aps": {
@@ -208,11 +400,7 @@ class FCMServiceV1:
                     }
                 }
             },
-            "webpush": {
-                "notification": {
-                    "icon": "/icon-192.png"
-                }
-            }
+            "webpush": WEBPUSH_CONFIG
         }
         
         if data:
@@ -220,6 +408,67 @@ class FCMServiceV1:
         
         return message
     
+    def _build_message(
+        self,
+        token: str,
+        title: str,
+        body: str,
+        data: Optional[Dict[str, str]] = None,
+        badge: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Build a single FCM v1 message payload."""
+        return {**self._build_message_template(title, body, data, badge), "token": token}
+    
+    async def _auth_headers(self) -> Dict[str, str]:
+        """Request headers carrying a valid access token."""
+        access_token = await self._get_access_token()
+        return {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json"
+        }
+    
+    async def _post_message(self, payload: bytes, headers: Dict[str, str]) -> Dict[str, Any]:
+        """POST one encoded {"message": ...} body and normalize the FCM response."""
+        try:
+            client = await self._get_client()
+            response = await client.post(
+                self.api_url,
+                headers=headers,
+                content=payload
+            )
+            
+            if response.status_code == 200:
+                result = _json_loads(response.content)
+                logger.info(f"FCM v1 send success: {result.get('name', 'unknown')}")
+                return {"success": True, "message_id": result.get("name")}
+            elif response.status_code == 404 and b"UNREGISTERED" in response.content:
+                # Dead token: a substring check confirms it without parsing the body.
+                # Other 404s (wrong project id or URL) fall through to the full parse.
+                logger.info("FCM v1 send failed: token unregistered")
+                return {
+                    "success": False,
+                    "error": "UNREGISTERED",
+                    "error_code": "UNREGISTERED",
+                    "status_code": 404
+                }
+            else:
+                error_data = _json_loads(response.content) if response.content else {}
+                logger.error(f"FCM v1 send failed: {response.status_code} - {error_data}")
+                error = error_data.get("error", {})
+                error_code = next(
+                    (d["errorCode"] for d in error.get("details", []) if d.get("errorCode")), None
+                )
+                return {
+                    "success": False, 
+                    "error": error.get("message", "Unknown error"),
+                    "error_code": error_code,
+                    "status_code": response.status_code
+                }
+                
+        except Exception as e:
+            logger.error(f"FCM v1 send failed: {e}")
+            return {"success": False, "error": str(e)}
+    
     async def send_to_token(
         self,
         token: str,
@@ -245,41 +494,30 @@ class FCMServiceV1:
             logger.debug(f"Push disabled - would send to token: {title}")
             return {"success": False, "message": "Push notifications disabled"}
         
+        now = time.monotonic()
+        if _is_known_invalid_token(token, now):
+            return {"success": False, "error": "UNREGISTERED", "error_code": "UNREGISTERED", "skipped": True}
+        
+        dedup_key = (token, _notification_digest(title, body))
+        if _expiring_has(_recent_sends, dedup_key, now):
+            return {"success": True, "dedup": True}
+        # Claimed before sending so a concurrent duplicate is dropped too
+        _expiring_add(_recent_sends, dedup_key, _DEDUP_WINDOW_SECONDS, _DEDUP_MAX_ENTRIES)
+        
         try:
-            access_token = await self._get_access_token()
-            
-            headers = {
-                "Authorization": f"Bearer {access_token}",
-                "Content-Type": "application/json"
-            }
-            
-            payload = {
-                "message": self._build_message(token, title, body, data, badge)
-            }
-            
-            client = await self._get_client()
-            response = await client.post(
-                self.api_url,
-                headers=headers,
-                json=payload
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                logger.info(f"FCM v1 send success: {result.get('name', 'unknown')}")
-                return {"success": True, "message_id": result.get("name")}
-            else:
-                error_data = response.json() if response.content else {}
-                logger.error(f"FCM v1 send failed: {response.status_code} - {error_data}")
-                return {
-                    "success": False, 
-                    "error": error_data.get("error", {}).get("message", "Unknown error"),
-                    "status_code": response.status_code
-                }
-                
+            headers = await self._auth_headers()
         except Exception as e:
             logger.error(f"FCM v1 send failed: {e}")
+            _recent_sends.pop(dedup_key, None)
             return {"success": False, "error": str(e)}
+        
+        payload = _json_dumps({"message": self._build_message(token, title, body, data, badge)})
+        result = await self._post_message(payload, headers)
+        if not result.get("success"):
+            _recent_sends.pop(dedup_key, None)
+            if _is_invalid_token_result(result):
+                _remember_invalid_token(token)
+        return result
     
     async def send_to_tokens(
         self,
@@ -292,8 +530,11 @@ class FCMServiceV1:
         """
         Send push notification to multiple device tokens.
         
-        Note: FCM v1 API doesn't support batch sending in a single request,
-        so we send to each token individually with concurrency control.
+        Note: FCM v1 API doesn't support batch sending in a single request
+        (the multipart /batch endpoint was shut down in 2024), so we send to
+        each token individually from a pool of FCM_MAX_CONNECTIONS workers
+        (multiplexed over HTTP/2 when available).
+        The message body and auth headers are built once per broadcast.
         
         Args:
             tokens: List of FCM device tokens
@@ -312,34 +553,74 @@ class FCMServiceV1:
             logger.debug(f"Push disabled - would send to {len(tokens)} tokens: {title}")
             return {"success": 0, "failure": 0, "message": "Push notifications disabled"}
         
-        # Limit concurrent requests to avoid rate limiting
-        semaphore = asyncio.Semaphore(10)
+        # Tokens FCM already rejected are reported as failed, and tokens that just
+        # received this same notification as delivered, without another request
+        now = time.monotonic()
+        digest = _notification_digest(title, body)
+        known_invalid: List[str] = []
+        duplicates = 0
+        to_send: List[str] = []
+        for token in tokens:
+            if _is_known_invalid_token(token, now):
+                known_invalid.append(token)
+            elif _expiring_has(_recent_sends, (token, digest), now):
+                duplicates += 1
+            else:
+                _expiring_add(_recent_sends, (token, digest), _DEDUP_WINDOW_SECONDS, _DEDUP_MAX_ENTRIES)
+                to_send.append(token)
+        tokens = to_send
+        if not tokens:
+            return {"success": duplicates, "failure": len(known_invalid), "failed_tokens": known_invalid}
+        
+        try:
+            headers = await self._auth_headers()
+        except Exception as e:
+            logger.error(f"FCM v1 batch send failed: {e}")
+            for token in tokens:
+                _recent_sends.pop((token, digest), None)
+            return {
+                "success": duplicates,
+                "failure": len(tokens) + len(known_invalid),
+                "failed_tokens": known_invalid,
+                "error": str(e)
+            }
         
-        async def send_with_semaphore(token: str) -> Dict[str, Any]:
-            async with semaphore:
-                return await self.send_to_token(token, title, body, data, badge)
+        # Encode the shared message once; each send only splices in its token.
+        # The encoded {"message": {...}} ends in "}}", which the token field reopens.
+        template = self._build_message_template(title, body, data, badge)
+        prefix = _json_dumps({"message": template})[:-2] + b',"token":'
         
-        # Send to all tokens concurrently (with limit)
-        results = await asyncio.gather(
-            *[send_with_semaphore(token) for token in tokens],
-            return_exceptions=True
-        )
+        # A fixed set of workers drains the token list, one worker per pooled
+        # connection, so task count stays flat however large the broadcast is
+        results: List[Any] = [None] * len(tokens)
+        pending = iter(enumerate(tokens))
+        
+        async def send_worker() -> None:
+            for i, token in pending:
+                try:
+                    results[i] = await self._post_message(prefix + _json_dumps(token) + b"}}", headers)
+                except Exception as e:
+                    results[i] = e
         
-        success_count = 0
-        failure_count = 0
-        failed_tokens = []
+        await asyncio.gather(*[send_worker() for _ in range(min(FCM_MAX_CONNECTIONS, len(tokens)))])
+        
+        success_count = duplicates
+        failure_count = len(known_invalid)
+        failed_tokens = list(known_invalid)
         
         for i, result in enumerate(results):
             if isinstance(result, Exception):
                 failure_count += 1
                 failed_tokens.append(tokens[i])
+                _recent_sends.pop((tokens[i], digest), None)
             elif result.get("success"):
                 success_count += 1
             else:
                 failure_count += 1
+                _recent_sends.pop((tokens[i], digest), None)
                 # Check for invalid token errors
-                error = result.get("error", "")
-                if "not a valid FCM registration token" in str(error).lower():
+                if _is_invalid_token_result(result):
+                    _remember_invalid_token(tokens[i])
                     failed_tokens.append(tokens[i])
         
         logger.info(f"FCM v1 batch send: success={success_count}, failure={failure_count}")
@@ -387,13 +668,7 @@ class FCMServiceV1:
                     "title": title,
                     "body": body
                 },
-                "android": {
-                    "priority": "high",
-                    "notification": {
-                        "channel_id": "daily_questions",
-                        "sound": "default"
-                    }
-                },
+                "android": ANDROID_CONFIG,
                 "apns": {
                     "payload": {
                         "aps": {
@@ -412,15 +687,15 @@ class FCMServiceV1:
             response = await client.post(
                 self.api_url,
                 headers=headers,
-                json=payload
+                content=_json_dumps(payload)
             )
             
             if response.status_code == 200:
-                result = response.json()
+                result = _json_loads(response.content)
                 logger.info(f"FCM v1 topic send to '{topic}': {result.get('name', 'success')}")
                 return {"success": True, "message_id": result.get("name")}
             else:
-                error_data = response.json() if response.content else {}
+                error_data = _json_loads(response.content) if response.content else {}
                 logger.error(f"FCM v1 topic send failed: {response.status_code} - {error_data}")
                 return {"success": False, "error": error_data}
                 
@@ -431,6 +706,8 @@ class FCMServiceV1:
 
 # ============= Global Service Instance =============
 _fcm_service: Optional[FCMServiceV1] = None
+# Event loop that owns the shared client; worker threads hand sends to it
+_service_loop: Optional[asyncio.AbstractEventLoop] = None
 
 
 def get_fcm_service() -> Optional[FCMServiceV1]:
@@ -446,6 +723,59 @@ def get_fcm_service() -> Optional[FCMServiceV1]:
     return _fcm_service
 
 
+async def start_push_service(client: "httpx.AsyncClient") -> Optional[FCMServiceV1]:
+    """Install the app-wide FCM service on `client`; called from the app lifespan."""
+    global _fcm_service, _service_loop
+    
+    if not is_push_enabled():
+        return None
+    
+    _service_loop = asyncio.get_running_loop()
+    _fcm_service = FCMServiceV1(project_id=FCM_PROJECT_ID, client=client)
+    return _fcm_service
+
+
+async def stop_push_service() -> None:
+    """Drop the app-wide FCM service; the lifespan closes the client itself."""
+    global _fcm_service, _service_loop
+    
+    if _fcm_service is not None:
+        await _fcm_service.close()
+    _fcm_service = None
+    _service_loop = None
+
+
+async def warmup_push_service() -> None:
+    """Open the OAuth and FCM connections ahead of the first real send.
+    
+    Fetches the first access token (TLS to the token endpoint) and issues a
+    throwaway GET to the send URL so a keep-alive connection to FCM sits in the
+    pool. Failures are only logged; sends will simply connect on demand.
+    """
+    service = get_fcm_service()
+    if service is None:
+        return
+    try:
+        await service.warmup()
+        logger.info("FCM connections warmed up")
+    except Exception as e:
+        logger.warning(f"FCM warmup failed (sends will connect on demand): {e}")
+
+
+def run_push_task(coro, wait: bool = False):
+    """Run a push coroutine from synchronous code (worker or scheduler threads).
+    
+    The shared client belongs to the app's event loop, so the coroutine is
+    scheduled there. With `wait=True` the call blocks for the result. Outside
+    the app (no lifespan), the coroutine runs on a fresh loop instead.
+    """
+    loop = _service_loop
+    if loop is None or loop.is_closed():
+        return asyncio.run(coro)
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    return future.result() if wait else None
+
+
 # ============= Convenience Functions =============
 
 async def notify_new_question(
@@ -472,8 +802,7 @@ async def notify_new_question(
     if tokens:
         result = await service.send_to_tokens(tokens, title, body, data)
     else:
-        topic = f"group_{group_id.replace('-', '_')}"
-        result = await service.send_to_topic(topic, title, body, data)
+        result = await service.send_to_topic(_group_topic(group_id), title, body, data)
     
     return {"sent": True, **result}
 
@@ -531,8 +860,7 @@ async def notify_results_available(
     if tokens:
         result = await service.send_to_tokens(tokens, title, body, data)
     else:
-        topic = f"group_{group_id.replace('-', '_')}"
-        result = await service.send_to_topic(topic, title, body, data)
+        result = await service.send_to_topic(_group_topic(group_id), title, body, data)
     
     return {"sent": True, **result}
 
@@ -1,37 +1,42 @@
 
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional, List, Union
+from pydantic import BaseModel, Field, StringConstraints, TypeAdapter, field_validator
+from typing import Annotated, Dict, Optional, List, Union
 from datetime import datetime
 from enum import Enum
 import re
 
-# ============= Admin Schemas =============
-class AdminLoginRequest(BaseModel):
-    username: str
-    password: str
+# Patterns used by validators, compiled once
+# HTML tags, the javascript: protocol and inline event handlers, in one alternation
+_XSS_RE = re.compile(r'<[^>]+>|javascript:|on\w+\s*=', re.IGNORECASE)
 
-class AdminLoginResponse(BaseModel):
-    temp_token: str
-    message: str = "2FA required"
 
-class Admin2FARequest(BaseModel):
-    temp_token: str
-    totp_code: str
+def _strip_markup(value: str) -> str:
+    # Every pattern needs '<', ':' or '='; typical input has none and skips the regex
+    if '<' not in value and ':' not in value and '=' not in value:
+        return value
+    # Remove common XSS vectors in one pass; repeat only if a removal spliced
+    # together a new match (e.g. "java<b>script:"). Clean input takes one scan.
+    value, removed = _XSS_RE.subn('', value)
+    while removed:
+        value, removed = _XSS_RE.subn('', value)
+    return value
 
-class Admin2FAResponse(BaseModel):
-    access_token: str
-    token_type: str = "bearer"
 
+def sanitize_html(value: str) -> str:
+    """Remove HTML tags and scripts and trim whitespace.
 
-def sanitize_string(value: str, max_length: int = 1000) -> str:
-    """Sanitize string input: remove HTML tags and scripts."""
+    Length is left to the field's max_length, which Pydantic enforces before
+    the validators run.
+    """
     if not isinstance(value, str):
         return value
-    # Remove common XSS vectors
-    value = re.sub(r'<[^>]+>', '', value)  # Remove HTML tags
-    value = re.sub(r'javascript:', '', value, flags=re.IGNORECASE)  # Remove javascript: protocol
-    value = re.sub(r'on\w+\s*=', '', value, flags=re.IGNORECASE)  # Remove event handlers
-    return value[:max_length].strip()
+    return _strip_markup(value).strip()
+
+
+# Pure format checks run inside pydantic-core instead of Python validators.
+# The pattern is checked before to_upper, so it accepts either case.
+InviteCode = Annotated[str, StringConstraints(strip_whitespace=True, to_upper=True, pattern=r'^[A-Za-z0-9]{6,8}$')]
+HexColor = Annotated[str, StringConstraints(strip_whitespace=True, pattern=r'^#[A-Fa-f0-9]{6}$')]
 
 
 class QuestionTypeEnum(str, Enum):
@@ -51,7 +56,7 @@ class GroupCreate(BaseModel):
     @field_validator('name')
     @classmethod
     def validate_name(cls, v):
-        v = sanitize_string(v, 100)
+        v = sanitize_html(v)
         if not v or not v.strip():
             raise ValueError('Group name cannot be empty')
         return v
@@ -66,6 +71,10 @@ class GroupResponse(BaseModel):
     created_at: datetime
     member_count: int
 
+    class Config:
+        from_attributes = True
+        frozen = True
+
 class GroupResponsePublic(BaseModel):
     id: int
     group_id: str
@@ -74,12 +83,16 @@ class GroupResponsePublic(BaseModel):
     created_at: datetime
     member_count: int
 
+    class Config:
+        from_attributes = True
+        frozen = True
+
 # ============= User Schemas =============
 
 class UserCreate(BaseModel):
     display_name: str = Field(..., min_length=1, max_length=50)
-    group_invite_code: str = Field(..., min_length=1, max_length=10)
-    color_avatar: Optional[str] = Field(
+    group_invite_code: InviteCode
+    color_avatar: Optional[HexColor] = Field(
         default=None,
         description="Optional hex color like #AABBCC"
     )
@@ -87,30 +100,13 @@ class UserCreate(BaseModel):
     @field_validator('display_name')
     @classmethod
     def validate_display_name(cls, v):
-        v = sanitize_string(v, 50)
+        v = sanitize_html(v)
         if not v or not v.strip():
             raise ValueError('Display name cannot be empty')
         if len(v) < 1:
             raise ValueError('Display name too short')
         return v
-    
-    @field_validator('group_invite_code')
-    @classmethod
-    def validate_invite_code(cls, v):
-        v = v.strip().upper()
-        if not re.match(r'^[A-Z0-9]{6,8}$', v):
-            raise ValueError('Invalid invite code format')
-        return v
 
-    @field_validator('color_avatar')
-    @classmethod
-    def validate_color(cls, v):
-        if v is None:
-            return v
-        v = v.strip()
-        if not re.match(r'^#([A-Fa-f0-9]{6})$', v):
-            raise ValueError('color_avatar must be a hex color like #AABBCC')
-        return v
 
 class UserResponse(BaseModel):
     id: int
@@ -124,6 +120,10 @@ class UserResponse(BaseModel):
     answer_streak: int = 0
     longest_answer_streak: int = 0
 
+    class Config:
+        from_attributes = True
+        frozen = True
+
 # ============= Daily Question Schemas =============
 
 class DailyQuestionCreate(BaseModel):
@@ -137,7 +137,7 @@ class DailyQuestionCreate(BaseModel):
     @field_validator('question_text')
     @classmethod
     def validate_question(cls, v):
-        v = sanitize_string(v, 255)
+        v = sanitize_html(v)
         if not v or not v.strip():
             raise ValueError('Question text cannot be empty')
         return v
@@ -147,7 +147,7 @@ class DailyQuestionCreate(BaseModel):
     def validate_option_a(cls, v):
         if v is None:
             return v
-        v = sanitize_string(v, 100)
+        v = sanitize_html(v)
         if v and len(v.strip()) == 0:
             return None
         return v
@@ -157,27 +157,35 @@ class DailyQuestionCreate(BaseModel):
     def validate_option_b(cls, v):
         if v is None:
             return v
-        v = sanitize_string(v, 100)
+        v = sanitize_html(v)
         if v and len(v.strip()) == 0:
             return None
         return v
 
-class DailyQuestionResponse(BaseModel):
+class DailyQuestionCore(BaseModel):
     id: int
     question_id: str
     question_text: str
     question_type: QuestionTypeEnum
-    options: list | None = None  # list of member names or duo labels (or null for free_text)
-    option_counts: dict | None = None  # vote counts per option
     question_date: datetime
     is_active: bool
     total_votes: int
+
+    class Config:
+        from_attributes = True
+        frozen = True
+
+class DailyQuestionResponse(DailyQuestionCore):
+    options: Optional[List[str]] = None  # member names or duo labels (null for free_text)
+    option_counts: Optional[Dict[str, int]] = None  # vote counts per option
     allow_multiple: bool = False
     user_vote: Optional[Union[str, List[str]]] = None
     user_text_answer: Optional[str] = None
     user_streak: int = 0
     longest_streak: int = 0
-    # Deprecated fields (kept for backward compatibility):
+
+class DailyQuestionLegacyResponse(DailyQuestionResponse):
+    """Adds the deprecated two-option fields; only sent to clients that ask via X-Legacy-Client"""
     option_a: Optional[str] = None
     option_b: Optional[str] = None
     vote_count_a: int = 0
@@ -197,7 +205,7 @@ class AnswerSubmissionCreate(BaseModel):
     def validate_text_answer(cls, v):
         if v is None:
             return v
-        v = sanitize_string(v, 1000)
+        v = sanitize_html(v)
         if v and len(v.strip()) == 0:
             return None
         return v
@@ -215,7 +223,7 @@ class QuestionTemplateCreate(BaseModel):
     @field_validator('category')
     @classmethod
     def validate_category(cls, v):
-        v = sanitize_string(v, 50)
+        v = sanitize_html(v)
         if not v or not v.strip():
             raise ValueError('Category cannot be empty')
         return v
@@ -223,7 +231,7 @@ class QuestionTemplateCreate(BaseModel):
     @field_validator('question_text')
     @classmethod
     def validate_question(cls, v):
-        v = sanitize_string(v, 255)
+        v = sanitize_html(v)
         if not v or not v.strip():
             raise ValueError('Question text cannot be empty')
         return v
@@ -239,6 +247,10 @@ class QuestionTemplateResponse(BaseModel):
     is_public: bool
     created_at: datetime
 
+    class Config:
+        from_attributes = True
+        frozen = True
+
 
 # ============= Question Set Schemas =============
 
@@ -246,7 +258,7 @@ class QuestionSetCreate(BaseModel):
     name: str = Field(..., min_length=1, max_length=150)
     description: Optional[str] = None
     template_ids: Optional[list[str]] = None
-    is_public: Optional[bool] = True
+    is_public: bool = True
 
 
 class QuestionSetResponse(BaseModel):
@@ -257,15 +269,22 @@ class QuestionSetResponse(BaseModel):
     templates: Optional[list[QuestionTemplateResponse]] = None
     created_at: datetime
 
+    class Config:
+        from_attributes = True
+        frozen = True
+
 
 class GroupQuestionSetsResponse(BaseModel):
     group_id: str
     question_sets: list[QuestionSetResponse]
 
+    class Config:
+        frozen = True
+
 
 class GroupAssignSetsRequest(BaseModel):
     question_set_ids: list[str]
-    replace: Optional[bool] = False
+    replace: bool = False
 
 
 # ============= Push Notification Schemas =============
@@ -279,13 +298,13 @@ class DeviceTokenRegister(BaseModel):
     @field_validator('token')
     @classmethod
     def validate_token(cls, v):
-        return sanitize_string(v, 255)
+        return sanitize_html(v)
     
     @field_validator('device_name')
     @classmethod
     def validate_device_name(cls, v):
         if v:
-            return sanitize_string(v, 100)
+            return sanitize_html(v)
         return v
 
 
@@ -298,8 +317,18 @@ class DeviceTokenResponse(BaseModel):
     created_at: datetime
     is_active: bool
 
+    class Config:
+        from_attributes = True
+        frozen = True
+
+
+# Built once at import; validates ORM rows and dumps JSON bytes in one Rust pass
+DeviceTokenListAdapter = TypeAdapter(list[DeviceTokenResponse])
+
 
 class PushNotificationStatus(BaseModel):
     """Status of push notification feature"""
     enabled: bool
-    message: str
\ No newline at end of file
+    message: str
+    class Config:
+        frozen = True
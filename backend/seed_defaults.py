@@ -1,6 +1,7 @@
 import logging
 from typing import List, Dict
 
+from sqlalchemy import and_, text, tuple_
 from sqlalchemy.orm import Session
 
 from database import SessionLocal
@@ -45,6 +46,128 @@ def _default_templates() -> List[Dict]:
     ]
 
 
+# Built once; the seed list is static for the lifetime of the process
+_DEFAULT_TEMPLATES = tuple(_default_templates())
+
+
+def _ensure_default_set(db: Session) -> QuestionSet:
+    """Create/ensure the Default set, its templates and their associations.
+
+    Flushes but does not commit; the caller owns the transaction.
+    """
+    # Ensure the default set exists
+    default_set = db.query(QuestionSet).filter(QuestionSet.name == DEFAULT_SET_NAME).first()
+    if not default_set:
+        default_set = QuestionSet(
+            name=DEFAULT_SET_NAME,
+            description=DEFAULT_SET_DESCRIPTION,
+            is_public=True,
+        )
+        db.add(default_set)
+        db.flush()
+    else:
+        # Normalize description and visibility
+        if not default_set.description or "extreme" in (default_set.description or "").lower():
+            default_set.description = DEFAULT_SET_DESCRIPTION
+        if default_set.is_public is not True:
+            default_set.is_public = True
+
+    # Load every matching template in one query, keyed by question_text + question_type
+    keys = [(t["question_text"], t["question_type"]) for t in _DEFAULT_TEMPLATES]
+    existing_by_key = {
+        (tpl.question_text, tpl.question_type): tpl
+        for tpl in db.query(QuestionTemplate)
+        .filter(tuple_(QuestionTemplate.question_text, QuestionTemplate.question_type).in_(keys))
+        .all()
+    }
+
+    template_ids = []
+    missing = []
+    for t in _DEFAULT_TEMPLATES:
+        existing = existing_by_key.get((t["question_text"], t["question_type"]))
+        if existing is None:
+            missing.append({
+                "category": t.get("category", "Default"),
+                "question_text": t["question_text"],
+                "option_a_template": t.get("option_a_template"),
+                "option_b_template": t.get("option_b_template"),
+                "question_type": t["question_type"],
+                "allow_multiple": t.get("allow_multiple", False),
+                "is_public": True,
+            })
+            continue
+        # Keep allow_multiple in sync with the seed definition
+        desired_multi = t.get("allow_multiple", False)
+        if getattr(existing, "allow_multiple", False) != desired_multi:
+            existing.allow_multiple = desired_multi
+        template_ids.append(existing.id)
+
+    if missing:
+        # return_defaults fills in each mapping's generated primary key
+        db.bulk_insert_mappings(QuestionTemplate, missing, return_defaults=True)
+        template_ids.extend(m["id"] for m in missing)
+
+    # Ensure associations to the Default set
+    linked = {
+        template_id
+        for (template_id,) in db.query(QuestionSetTemplate.template_id)
+        .filter(QuestionSetTemplate.question_set_id == default_set.id)
+        .all()
+    }
+    db.bulk_insert_mappings(QuestionSetTemplate, [
+        {"question_set_id": default_set.id, "template_id": template_id}
+        for template_id in template_ids
+        if template_id not in linked
+    ])
+
+    return default_set
+
+
+def _assign_default_set(db: Session, default_set: QuestionSet) -> None:
+    """Give every group without an active question set the Default set."""
+    # Late import to avoid circulars at module import time
+    from models import Group, GroupQuestionSet
+
+    # Groups with no active assignment, found in one anti-join
+    unassigned_ids = [
+        gid
+        for (gid,) in db.query(Group.id)
+        .outerjoin(
+            GroupQuestionSet,
+            and_(GroupQuestionSet.group_id == Group.id, GroupQuestionSet.is_active == True),
+        )
+        .filter(GroupQuestionSet.id.is_(None))
+        .all()
+    ]
+    db.bulk_insert_mappings(GroupQuestionSet, [
+        {"group_id": gid, "question_set_id": default_set.id, "is_active": True}
+        for gid in unassigned_ids
+    ])
+
+
+def _seed(db: Session) -> None:
+    """Run both seeders against one session."""
+    _assign_default_set(db, _ensure_default_set(db))
+
+
+def _relax_commit(db: Session) -> None:
+    """Don't wait for the WAL flush on Postgres; the seed is idempotent and re-runs on boot."""
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("SET LOCAL synchronous_commit = off"))
+
+
+def seed_default_question_sets():
+    """Ensure the Default set and assign it to unassigned groups in one transaction.
+
+    Idempotent: safe to call on every startup. Errors propagate so startup can
+    report them; closing the session rolls back.
+    """
+    with SessionLocal() as db:
+        _relax_commit(db)
+        _seed(db)
+        db.commit()
+
+
 def initialize_default_question_set():
     """Create/ensure the Default question set and its templates exist.
 
@@ -54,78 +177,13 @@ def initialize_default_question_set():
     - Ensures associations between the set and templates
     - Updates description away from any previous 'extreme' wording
     """
-    db: Session = SessionLocal()
-    try:
-        # Ensure the default set exists
-        default_set = db.query(QuestionSet).filter(QuestionSet.name == DEFAULT_SET_NAME).first()
-        if not default_set:
-            default_set = QuestionSet(
-                name=DEFAULT_SET_NAME,
-                description=DEFAULT_SET_DESCRIPTION,
-                is_public=True,
-            )
-            db.add(default_set)
+    with SessionLocal() as db:
+        try:
+            _ensure_default_set(db)
             db.commit()
-            db.refresh(default_set)
-        else:
-            # Normalize description and visibility
-            changed = False
-            if not default_set.description or "extreme" in (default_set.description or "").lower():
-                default_set.description = DEFAULT_SET_DESCRIPTION
-                changed = True
-            if default_set.is_public is not True:
-                default_set.is_public = True
-                changed = True
-            if changed:
-                db.commit()
-
-        # Ensure templates and associations
-        for t in _default_templates():
-            # Try to find by question_text + question_type to avoid duplicates across runs
-            existing = (
-                db.query(QuestionTemplate)
-                .filter(
-                    QuestionTemplate.question_text == t["question_text"],
-                    QuestionTemplate.question_type == t["question_type"],
-                )
-                .first()
-            )
-            if not existing:
-                existing = QuestionTemplate(
-                    category=t.get("category", "Default"),
-                    question_text=t["question_text"],
-                    option_a_template=t.get("option_a_template"),
-                    option_b_template=t.get("option_b_template"),
-                    question_type=t["question_type"],
-                    allow_multiple=t.get("allow_multiple", False),
-                    is_public=True,
-                )
-                db.add(existing)
-                db.flush()
-            else:
-                # Keep allow_multiple in sync with the seed definition
-                desired_multi = t.get("allow_multiple", False)
-                if getattr(existing, "allow_multiple", False) != desired_multi:
-                    existing.allow_multiple = desired_multi
-
-            # Ensure association to Default set
-            assoc_exists = (
-                db.query(QuestionSetTemplate)
-                .filter(
-                    QuestionSetTemplate.question_set_id == default_set.id,
-                    QuestionSetTemplate.template_id == existing.id,
-                )
-                .first()
-            )
-            if not assoc_exists:
-                db.add(QuestionSetTemplate(question_set_id=default_set.id, template_id=existing.id))
-
-        db.commit()
-    except Exception:
-        logging.exception("initialize_default_question_set failed")
-        db.rollback()
-    finally:
-        db.close()
+        except Exception:
+            logging.exception("initialize_default_question_set failed")
+            db.rollback()
 
 
 def assign_default_set_to_unassigned_groups():
@@ -134,30 +192,10 @@ def assign_default_set_to_unassigned_groups():
     Idempotent: skips groups already assigned. Useful for existing groups
     created before this feature.
     """
-    db: Session = SessionLocal()
-    try:
-        default_set = db.query(QuestionSet).filter(QuestionSet.name == DEFAULT_SET_NAME).first()
-        if not default_set:
-            initialize_default_question_set()
-            default_set = db.query(QuestionSet).filter(QuestionSet.name == DEFAULT_SET_NAME).first()
-            if not default_set:
-                logging.warning("Default set not found; cannot assign to groups")
-                return
-
-        # Late import to avoid circulars at module import time
-        from models import Group, GroupQuestionSet
-
-        groups = db.query(Group).all()
-        for g in groups:
-            has_set = db.query(GroupQuestionSet).filter(
-                GroupQuestionSet.group_id == g.id,
-                GroupQuestionSet.is_active == True,
-            ).first()
-            if not has_set:
-                db.add(GroupQuestionSet(group_id=g.id, question_set_id=default_set.id, is_active=True))
-        db.commit()
-    except Exception:
-        logging.exception("assign_default_set_to_unassigned_groups failed")
-        db.rollback()
-    finally:
-        db.close()
+    with SessionLocal() as db:
+        try:
+            _seed(db)
+            db.commit()
+        except Exception:
+            logging.exception("assign_default_set_to_unassigned_groups failed")
+            db.rollback()
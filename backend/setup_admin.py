@@ -12,13 +12,15 @@ from datetime import datetime, timezone
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from database import SessionLocal
-from models import AdminUser
-from admin_auth import hash_password, get_totp_secret, get_totp_uri
-import pyotp
+from models import ADMIN_BCRYPT_ROUNDS, AdminUser, hash_password
 
 
 def setup_admin():
     """Create initial admin user"""
+    # One-shot CLI: only pay for the auth stack when actually creating an admin
+    from admin_auth import get_totp_secret, get_totp_uri
+    import pyotp
+
     db = SessionLocal()
     
     try:
@@ -50,7 +52,7 @@ def setup_admin():
             return
         
         # Hash password
-        password_hash = hash_password(password)
+        password_hash = hash_password(password, rounds=ADMIN_BCRYPT_ROUNDS)
         
         # Generate TOTP secret
         totp_secret = get_totp_secret()
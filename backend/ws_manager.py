@@ -1,80 +1,315 @@
-from typing import Set, Dict
-import json
+from typing import Set, Dict, Optional, Tuple, Union
+import asyncio
 import logging
+from contextlib import suppress
+from dataclasses import dataclass
 from datetime import datetime, timezone
+
+import orjson
 # pylint: disable=broad-except
 
+logger = logging.getLogger(__name__)
+
+MSGPACK_AVAILABLE = False
+
+try:
+    import ormsgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    pass
+
+REDIS_AVAILABLE = False
+
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError
+    REDIS_AVAILABLE = True
+except ImportError:
+    pass
+
+# Send failures that mean the peer is gone; anything else raised by a send is a bug
+_SEND_ERRORS: tuple = (OSError, RuntimeError)
+
+try:
+    from websockets.exceptions import ConnectionClosed
+    _SEND_ERRORS += (ConnectionClosed,)
+except ImportError:
+    pass
+
+# Clients that offer this subprotocol get binary MessagePack frames instead of JSON text
+MSGPACK_SUBPROTOCOL = "msgpack"
+
+# Pub/sub channel every worker listens on when the Redis backplane is enabled
+BACKPLANE_CHANNEL = "dontaskus:ws"
+BACKPLANE_RETRY_SECONDS = 1.0
+
+
+@dataclass(slots=True)
+class Envelope:
+    """Broadcast frame; orjson/ormsgpack encode it (and the datetime) natively."""
+    type: str
+    timestamp: datetime
+    data: Union[dict, bytes]  # bytes: already-serialized JSON
+
+
+# Constant JSON framing for the broadcast types; only the timestamp and data are
+# encoded per broadcast and spliced in (same output as dumping the Envelope)
+_FRAME_PREFIXES = {
+    frame_type: b'{"type":' + orjson.dumps(frame_type) + b',"timestamp":'
+    for frame_type in ("update", "group_update")
+}
+_FRAME_DATA = b',"data":'
+
+
+class Room:
+    """A set of connections plus a tuple snapshot reused across broadcasts.
+
+    The snapshot is rebuilt lazily after a connect/disconnect, so steady-state
+    broadcasts iterate it without copying the set each time.
+    """
+    __slots__ = ("connections", "_snapshot")
+
+    def __init__(self):
+        self.connections: Set = set()
+        self._snapshot: Optional[tuple] = None
+
+    def __len__(self) -> int:
+        return len(self.connections)
+
+    def add(self, websocket):
+        self.connections.add(websocket)
+        self._snapshot = None
+
+    def difference_update(self, websockets):
+        before = len(self.connections)
+        self.connections.difference_update(websockets)
+        if len(self.connections) != before:
+            self._snapshot = None
+
+    def snapshot(self) -> tuple:
+        if self._snapshot is None:
+            self._snapshot = tuple(self.connections)
+        return self._snapshot
+
 
 class ConnectionManager:
     def __init__(self):
-        # Structure: {group_id: {question_id: set(websocket_connections)}}
-        self.active_connections: Dict[str, Dict[str, Set]] = {}
+        # Structure: {(group_id, question_id): Room(websocket_connections)}
+        self.active_connections: Dict[Tuple[str, str], Room] = {}
+        # Union of every room's connections per group, kept in step with active_connections
+        self.group_connections: Dict[str, Room] = {}
         self.user_map: Dict = {}  # Maps connection id to user info
+        self.msgpack_connections: Set = set()  # Connections that negotiated MSGPACK_SUBPROTOCOL
+        # Redis backplane; None means broadcasts only reach this process's sockets
+        self._redis = None
+        self._subscriber: Optional[asyncio.Task] = None
 
     async def connect(self, group_id: str, question_id: str, websocket):
-        await websocket.accept()
-
-        if group_id not in self.active_connections:
-            self.active_connections[group_id] = {}
+        if MSGPACK_AVAILABLE and MSGPACK_SUBPROTOCOL in websocket.scope.get("subprotocols", ()):
+            await websocket.accept(subprotocol=MSGPACK_SUBPROTOCOL)
+            self.msgpack_connections.add(websocket)
+        else:
+            await websocket.accept()
 
-        if question_id not in self.active_connections[group_id]:
-            self.active_connections[group_id][question_id] = set()
+        room = self.active_connections.get((group_id, question_id))
+        if room is None:
+            room = self.active_connections[(group_id, question_id)] = Room()
+        room.add(websocket)
+        group = self.group_connections.get(group_id)
+        if group is None:
+            group = self.group_connections[group_id] = Room()
+        group.add(websocket)
+        logger.debug("WebSocket connection opened: Group=%s, Question=%s", group_id, question_id)
 
-        self.active_connections[group_id][question_id].add(websocket)
-        logging.info("WebSocket connection opened: Group=%s, Question=%s", group_id, question_id)
+    def _remove(self, group_id: str, question_id: str, websockets):
+        """Drop connections from their room and group in one pass, cleaning up empty rooms."""
+        room = self.active_connections.get((group_id, question_id))
+        if room is not None:
+            room.difference_update(websockets)
+            if not room:
+                del self.active_connections[(group_id, question_id)]
+        group = self.group_connections.get(group_id)
+        if group is not None:
+            group.difference_update(websockets)
+            if not group:
+                del self.group_connections[group_id]
 
     def disconnect(self, group_id: str, question_id: str, websocket):
-        if (group_id in self.active_connections and
-                question_id in self.active_connections[group_id]):
-            self.active_connections[group_id][question_id].discard(websocket)
-
-            # Clean up empty structures
-            if not self.active_connections[group_id][question_id]:
-                del self.active_connections[group_id][question_id]
-            if not self.active_connections[group_id]:
-                del self.active_connections[group_id]
-
-        logging.info("WebSocket connection closed: Group=%s, Question=%s", group_id, question_id)
-
-    async def broadcast_update(self, group_id: str, question_id: str, data: dict):
-        """Broadcast update to all users in a specific question room"""
-        if (group_id in self.active_connections and
-                question_id in self.active_connections[group_id]):
-
-            message = json.dumps({
-                "type": "update",
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "data": data
-            })
-
-            # Use list to avoid "Set changed during iteration" error
-            connections = list(self.active_connections[group_id][question_id])
-            for connection in connections:
-                try:
-                    await connection.send_text(message)
-                except (OSError, RuntimeError):
-                    logging.exception("Error sending websocket message; removing connection")
-                    self.active_connections[group_id][question_id].discard(connection)
-
-    async def broadcast_to_group(self, group_id: str, data: dict):
-        """Broadcast to all active connections in a group"""
-        if group_id in self.active_connections:
-            message = json.dumps({
-                "type": "group_update",
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "data": data
-            })
-
-            # Flatten all connections in all questions for this group
-            all_connections = []
-            for connections_set in self.active_connections[group_id].values():
-                all_connections.extend(connections_set)
-
-            for connection in all_connections:
-                try:
-                    await connection.send_text(message)
-                except Exception:
-                    logging.exception("Error sending group websocket message")
+        self.msgpack_connections.discard(websocket)
+        self._remove(group_id, question_id, (websocket,))
+        logger.debug("WebSocket connection closed: Group=%s, Question=%s", group_id, question_id)
+
+    def encode(self, envelope: Envelope, connections) -> tuple:
+        """Encode a broadcast once per wire format the recipients use.
+
+        Returns (JSON text, MessagePack bytes); the bytes are None when no
+        recipient negotiated MessagePack.
+        """
+        data = envelope.data
+        # Pre-serialized JSON is spliced in as-is rather than parsed and re-encoded
+        raw = isinstance(data, (bytes, bytearray))
+        prefix = _FRAME_PREFIXES.get(envelope.type)
+        if prefix is None and not raw:
+            text = orjson.dumps(envelope, option=orjson.OPT_NON_STR_KEYS).decode()
+        else:
+            if prefix is None:
+                prefix = b'{"type":' + orjson.dumps(envelope.type) + b',"timestamp":'
+            encoded = data if raw else orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+            text = (prefix + orjson.dumps(envelope.timestamp) + _FRAME_DATA + encoded + b"}").decode()
+        binary = None
+        if not self.msgpack_connections.isdisjoint(connections):
+            if raw:
+                envelope = Envelope(envelope.type, envelope.timestamp, orjson.loads(data))
+            binary = ormsgpack.packb(envelope, option=ormsgpack.OPT_NON_STR_KEYS)
+        return text, binary
+
+    async def send_encoded(self, websocket, text: str, binary: Optional[bytes]):
+        """Send a pre-encoded message in the format the connection negotiated."""
+        if binary is not None and websocket in self.msgpack_connections:
+            await websocket.send_bytes(binary)
+        else:
+            await websocket.send_text(text)
+
+    async def _fan_out(self, connections, text: str, binary: Optional[bytes]) -> list:
+        """Send to every connection concurrently so one slow client doesn't stall the rest.
+
+        Returns one result per connection, with exceptions in place of failed sends.
+        """
+        return await asyncio.gather(
+            *(self.send_encoded(connection, text, binary) for connection in connections),
+            return_exceptions=True,
+        )
+
+    async def send(self, websocket, payload: dict):
+        """Send a single message to one connection."""
+        if websocket in self.msgpack_connections:
+            await websocket.send_bytes(ormsgpack.packb(payload, option=ormsgpack.OPT_NON_STR_KEYS))
+        else:
+            await websocket.send_text(orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS).decode())
+
+    async def receive(self, websocket) -> dict:
+        """Receive and decode one message, JSON text or MessagePack binary."""
+        if websocket in self.msgpack_connections:
+            return ormsgpack.unpackb(await websocket.receive_bytes())
+        return orjson.loads(await websocket.receive_text())
+
+    # ============= Redis Backplane =============
+
+    async def start_backplane(self, redis_url: str):
+        """Relay broadcasts through Redis pub/sub so every worker reaches its own sockets."""
+        if not REDIS_AVAILABLE:
+            logger.warning("redis package not installed; WebSocket broadcasts stay in-process")
+            return
+        self._redis = aioredis.from_url(redis_url)
+        self._subscriber = asyncio.create_task(self._subscribe())
+
+    async def stop_backplane(self):
+        if self._subscriber is not None:
+            self._subscriber.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._subscriber
+            self._subscriber = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def _subscribe(self):
+        """Fan out every published broadcast to this worker's connections, reconnecting on errors."""
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.subscribe(BACKPLANE_CHANNEL)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            await self._deliver(message["data"])
+            except Exception:
+                logger.exception("WebSocket backplane subscription failed; retrying")
+                await asyncio.sleep(BACKPLANE_RETRY_SECONDS)
+
+    async def _deliver(self, message: bytes):
+        # Wire format: JSON [group_id, question_id or null], newline, JSON data
+        header, _, data = message.partition(b"\n")
+        try:
+            group_id, question_id = orjson.loads(header)
+            if question_id is None:
+                await self._local_broadcast_to_group(group_id, data)
+            else:
+                await self._local_broadcast_update(group_id, question_id, data)
+        except Exception:
+            logger.exception("Error delivering backplane broadcast")
+
+    async def _publish(self, group_id: str, question_id: Optional[str], data: Union[dict, bytes]) -> bool:
+        """Publish a broadcast to all workers; False when it must be delivered locally instead."""
+        if self._redis is None:
+            return False
+        if not isinstance(data, (bytes, bytearray)):
+            data = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        try:
+            await self._redis.publish(BACKPLANE_CHANNEL, orjson.dumps([group_id, question_id]) + b"\n" + data)
+        except (RedisError, OSError):
+            logger.exception("Publishing to the WebSocket backplane failed; broadcasting locally")
+            return False
+        return True
+
+    # ============= Broadcasts =============
+
+    async def broadcast_update(self, group_id: str, question_id: str, data: Union[dict, bytes]):
+        """Broadcast update to all users in a specific question room
+
+        `data` may be a dict or already-serialized JSON bytes. With the Redis
+        backplane running, every worker delivers it to its own connections.
+        """
+        if not await self._publish(group_id, question_id, data):
+            await self._local_broadcast_update(group_id, question_id, data)
+
+    async def broadcast_to_group(self, group_id: str, data: Union[dict, bytes]):
+        """Broadcast to all active connections in a group
+
+        `data` may be a dict or already-serialized JSON bytes.
+        """
+        if not await self._publish(group_id, None, data):
+            await self._local_broadcast_to_group(group_id, data)
+
+    async def _local_broadcast_update(self, group_id: str, question_id: str, data: Union[dict, bytes]):
+        room = self.active_connections.get((group_id, question_id))
+        if room:
+            # Immutable snapshot: safe if the room changes while sends are in flight
+            connections = room.snapshot()
+
+            # Encoded once per broadcast and wire format, not per connection
+            text, binary = self.encode(Envelope("update", datetime.now(timezone.utc), data), connections)
+
+            results = await self._fan_out(connections, text, binary)
+            dead = []
+            unexpected = None
+            for connection, result in zip(connections, results):
+                if isinstance(result, _SEND_ERRORS):
+                    logger.error("Error sending websocket message; removing connection", exc_info=result)
+                    dead.append(connection)
+                elif isinstance(result, Exception) and unexpected is None:
+                    unexpected = result
+            if dead:
+                self._remove(group_id, question_id, dead)
+            if unexpected is not None:
+                raise unexpected
+
+    async def _local_broadcast_to_group(self, group_id: str, data: Union[dict, bytes]):
+        group = self.group_connections.get(group_id)
+        if group:
+            all_connections = group.snapshot()
+
+            # Encoded once per broadcast and wire format, not per connection
+            text, binary = self.encode(Envelope("group_update", datetime.now(timezone.utc), data), all_connections)
+
+            results = await self._fan_out(all_connections, text, binary)
+            unexpected = None
+            for result in results:
+                if isinstance(result, _SEND_ERRORS):
+                    logger.error("Error sending group websocket message", exc_info=result)
+                elif isinstance(result, Exception) and unexpected is None:
+                    unexpected = result
+            if unexpected is not None:
+                raise unexpected
 
 
 manager = ConnectionManager()